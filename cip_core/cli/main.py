@@ -501,7 +501,10 @@ def vm_models():
 @click.option("--path", "-p", default=".", help="Repository path")
 @click.option("--force", "-f", is_flag=True, help="Overwrite existing meta.yaml files")
 @click.option("--test-only", is_flag=True, help="Test on one directory only")
-def ai_enhance(model: str, path: str, force: bool, test_only: bool):
+@click.option("--jobs", "-j", default=4, type=click.IntRange(min=1),
+              help="Number of directories to enhance concurrently")
+@click.option("--no-cache", is_flag=True, help="Regenerate responses instead of reusing cached ones")
+def ai_enhance(model: str, path: str, force: bool, test_only: bool, jobs: int, no_cache: bool):
     """AI-enhanced metadata generation using local Ollama."""
     try:
         from ..ollama_local import AIMetadataEnhancer, test_ollama_integration
@@ -514,9 +517,9 @@ def ai_enhance(model: str, path: str, force: bool, test_only: bool):
             return
         
         # Full repository processing
-        enhancer = AIMetadataEnhancer(model)
+        enhancer = AIMetadataEnhancer(model, use_cache=not no_cache)
         repo_path = Path(path)
-        enhancer.process_repository(repo_path, force)
+        enhancer.process_repository(repo_path, force, jobs)
         
         click.echo("✅ AI-enhanced metadata generation complete!")
         
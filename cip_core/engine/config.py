@@ -17,6 +17,8 @@ class GenerationConfig:
     ai_model: Optional[str] = None
     custom_prompts_dir: Optional[str] = None
     quality_threshold: float = 0.7
+    use_cache: bool = True  # Reuse results of deterministic strategies
+    batch_writes: bool = True  # Flush meta.yaml files in one pass after generation
 
 
 @dataclass
@@ -94,7 +96,9 @@ class CIPConfig:
                 ai_provider=gen_data.get('ai_provider'),
                 ai_model=gen_data.get('ai_model'),
                 custom_prompts_dir=gen_data.get('custom_prompts_dir'),
-                quality_threshold=gen_data.get('quality_threshold', 0.7)
+                quality_threshold=gen_data.get('quality_threshold', 0.7),
+                use_cache=gen_data.get('use_cache', True),
+                batch_writes=gen_data.get('batch_writes', True)
             )
         
         # Update validation config
@@ -132,6 +136,8 @@ class CIPConfig:
                 'ai_model': self.generation.ai_model,
                 'custom_prompts_dir': self.generation.custom_prompts_dir,
                 'quality_threshold': self.generation.quality_threshold,
+                'use_cache': self.generation.use_cache,
+                'batch_writes': self.generation.batch_writes,
             },
             'validation': {
                 'enabled_rules': self.validation.enabled_rules,
@@ -178,7 +184,9 @@ class CIPConfig:
             ai_provider=other.generation.ai_provider or self.generation.ai_provider,
             ai_model=other.generation.ai_model or self.generation.ai_model,
             custom_prompts_dir=other.generation.custom_prompts_dir or self.generation.custom_prompts_dir,
-            quality_threshold=other.generation.quality_threshold if other.generation.quality_threshold != 0.7 else self.generation.quality_threshold
+            quality_threshold=other.generation.quality_threshold if other.generation.quality_threshold != 0.7 else self.generation.quality_threshold,
+            use_cache=other.generation.use_cache and self.generation.use_cache,
+            batch_writes=other.generation.batch_writes and self.generation.batch_writes
         )
         
         # Merge validation config
@@ -5,14 +5,20 @@ This module provides the main CIPEngine class that serves as the unified
 interface for all CIP functionality, replacing scattered automation classes.
 """
 
+import hashlib
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Iterable
+from dataclasses import dataclass, field, fields, asdict
 
 from .config import CIPConfig, GenerationConfig, ValidationRules
 from .repository import RepositoryManager, ProjectType
 
 
+# Field names accepted by CIPEngine.update_config
+_CONFIG_FIELDS = frozenset(f.name for f in fields(CIPConfig))
+
+
 @dataclass
 class InitConfig:
     """Configuration for repository initialization."""
@@ -25,6 +31,26 @@ class InitConfig:
     ai_model: Optional[str] = None
 
 
+@dataclass
+class InitResult:
+    """Result of repository initialization."""
+    success: bool
+    project_type: Optional[ProjectType]
+    files_created: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    config: Optional[InitConfig] = None
+
+
+@dataclass
+class DirectoryResult:
+    """Result of generating metadata for a single directory."""
+    key: str  # "root" or the directory path relative to the repository
+    meta_path: str
+    metadata: Optional[Dict[str, Any]] = None
+    status: Optional[str] = None  # "created", "updated", or None if not written
+    error: Optional[str] = None
+
+
 @dataclass
 class GenerationResult:
     """Result of metadata generation operation."""
@@ -34,6 +60,35 @@ class GenerationResult:
     errors: List[str]
     metadata: Dict[str, Any]
     quality_score: Optional[float] = None
+    
+    @classmethod
+    def from_iter(cls, results: Iterable[DirectoryResult]) -> 'GenerationResult':
+        """Collect streamed per-directory results into a single result."""
+        files_created = []
+        files_updated = []
+        errors = []
+        metadata = {}
+        
+        try:
+            for result in results:
+                if result.error is not None:
+                    errors.append(result.error)
+                    continue
+                if result.status == "created":
+                    files_created.append(result.meta_path)
+                elif result.status == "updated":
+                    files_updated.append(result.meta_path)
+                metadata[result.key] = result.metadata
+        except Exception as e:
+            errors.append(str(e))
+        
+        return cls(
+            success=len(errors) == 0,
+            files_created=files_created,
+            files_updated=files_updated,
+            errors=errors,
+            metadata=metadata
+        )
 
 
 @dataclass
@@ -86,39 +141,31 @@ class CIPEngine:
         else:
             self.config = config
         
-        # Initialize sub-engines (lazy loading)
-        self._metadata_engine = None
-        self._validation_engine = None
-        self._instruction_engine = None
+        # Digest of the configuration as last written to .cip/core.yaml
+        self._last_written_config_hash: Optional[str] = None
     
-    @property
+    @cached_property
     def metadata(self):
         """Get metadata engine (lazy loaded)."""
-        if self._metadata_engine is None:
-            # Import here to avoid circular imports
-            from ..generation import MetadataEngine
-            self._metadata_engine = MetadataEngine(self.repo, self.config)
-        return self._metadata_engine
+        # Import here to avoid circular imports
+        from ..generation import MetadataEngine
+        return MetadataEngine(self.repo, self.config)
     
-    @property
+    @cached_property
     def validation(self):
         """Get validation engine (lazy loaded).""" 
-        if self._validation_engine is None:
-            # Import here to avoid circular imports
-            from ..validation import ValidationEngine
-            self._validation_engine = ValidationEngine(self.repo)
-        return self._validation_engine
+        # Import here to avoid circular imports
+        from ..validation import ValidationEngine
+        return ValidationEngine(self.repo)
     
-    @property
+    @cached_property
     def instructions(self):
         """Get instruction engine (lazy loaded)."""
-        if self._instruction_engine is None:
-            # Import here to avoid circular imports
-            from ..instruction import InstructionEngine
-            self._instruction_engine = InstructionEngine(self.repo)
-        return self._instruction_engine
+        # Import here to avoid circular imports
+        from ..instruction import InstructionEngine
+        return InstructionEngine(self.repo)
     
-    def initialize_repository(self, config: InitConfig) -> InitConfig:
+    def initialize_repository(self, config: InitConfig) -> InitResult:
         """
         Initialize repository with CIP structure and metadata.
         
@@ -151,8 +198,7 @@ class CIPEngine:
                 self.config.generation.ai_model = config.ai_model
             
             # Save configuration
-            config_path = self.repo.cip_directory / "core.yaml"
-            self.config.save_to_file(str(config_path))
+            config_path = self._save_config()
             
             # Generate initial metadata
             generation_config = GenerationConfig(
@@ -173,7 +219,8 @@ class CIPEngine:
                     instruction_result.instructions_file if instruction_result.success else ""
                 ],
                 project_type=config.project_type,
-                errors=metadata_result.errors + instruction_result.errors
+                errors=metadata_result.errors + instruction_result.errors,
+                config=config
             )
             
         except Exception as e:
@@ -181,7 +228,8 @@ class CIPEngine:
                 success=False,
                 files_created=[],
                 project_type=config.project_type,
-                errors=[str(e)]
+                errors=[str(e)],
+                config=config
             )
     
     def generate_metadata(self, strategy: str = None, config: Optional[GenerationConfig] = None) -> GenerationResult:
@@ -275,28 +323,32 @@ class CIPEngine:
             }
         }
     
-    def update_config(self, updates: Dict[str, Any]) -> None:
-        """Update engine configuration."""
-        # Update configuration based on provided updates
+    def update_config(self, updates: Dict[str, Any], save: bool = True) -> None:
+        """
+        Update engine configuration.
+        
+        Args:
+            updates: Mapping of CIPConfig field names to new values.
+                Unknown keys are ignored.
+            save: Write the updated configuration to .cip/core.yaml
+        """
+        config = self.config
         for key, value in updates.items():
-            if hasattr(self.config, key):
-                setattr(self.config, key, value)
+            if key in _CONFIG_FIELDS:
+                setattr(config, key, value)
         
-        # Save updated configuration
-        config_path = self.repo.cip_directory / "core.yaml"
-        self.config.save_to_file(str(config_path))
-
-
-# Backwards compatibility alias
-@dataclass
-class InitResult(InitConfig):
-    """Result of repository initialization."""
-    success: bool = False
-    files_created: List[str] = None
-    errors: List[str] = None
+        if save:
+            self._save_config()
     
-    def __post_init__(self):
-        if self.files_created is None:
-            self.files_created = []
-        if self.errors is None:
-            self.errors = []
+    def _save_config(self) -> Path:
+        """Write the configuration to .cip/core.yaml unless it is unchanged."""
+        config_path = self.repo.cip_directory / "core.yaml"
+        config_hash = hashlib.blake2b(
+            repr(asdict(self.config)).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        
+        if config_hash != self._last_written_config_hash or not config_path.exists():
+            self.config.save_to_file(str(config_path))
+            self._last_written_config_hash = config_hash
+        
+        return config_path
@@ -5,13 +5,18 @@ This module handles repository-level state and operations,
 replacing scattered path management and file discovery logic.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple, FrozenSet, Sequence, Pattern
+import os
+import re
 import yaml
 import fnmatch
 from dataclasses import dataclass
 from enum import Enum
 
+from ..utils import YamlParser, YamlDumper, IO_WORKERS
+
 
 class ProjectType(Enum):
     """Repository project types."""
@@ -24,6 +29,20 @@ class ProjectType(Enum):
     INFRASTRUCTURE = "infrastructure"
 
 
+# Top-level names used by detect_project_type
+_THEORY_INDICATORS = frozenset(['experiments', 'theory', 'research', 'papers'])
+_SDK_FILE_INDICATORS = frozenset(['src', 'lib', 'setup.py', 'pyproject.toml', 'package.json'])
+_SDK_DIR_INDICATORS = frozenset(['src', 'lib'])
+_PROTOCOL_INDICATORS = frozenset(['spec', 'protocol', 'standards'])
+_DEVKIT_INDICATORS = frozenset(['tools', 'devkit', 'development'])
+
+# Flags for batched writes; O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Open files relative to their parent directory's descriptor where supported
+_USE_DIR_FD = os.open in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+
+
 @dataclass
 class DirectoryTree:
     """Represents a directory structure."""
@@ -38,6 +57,14 @@ class DirectoryTree:
         return len(self.metadata_files) > 0
 
 
+@dataclass
+class RepoScan:
+    """Result of a single walk over the repository."""
+    top_level_dirs: FrozenSet[str]
+    top_level_files: FrozenSet[str]
+    meta_yaml_paths: List[Path]
+
+
 class RepositoryManager:
     """
     Manages repository-level state and operations.
@@ -46,19 +73,13 @@ class RepositoryManager:
     
     def __init__(self, repo_path: str):
         self.path = Path(repo_path).resolve()
+        self.root_path = self.path
+        self.cip_directory = self.path / ".cip"
         self._config_cache: Optional[Dict[str, Any]] = None
         self._structure_cache: Optional[DirectoryTree] = None
+        self._scan_cache: Optional[RepoScan] = None
         self._gitignore_patterns: Optional[List[str]] = None
-    
-    @property
-    def root_path(self) -> Path:
-        """Get the repository root path."""
-        return self.path
-    
-    @property
-    def cip_directory(self) -> Path:
-        """Get the .cip directory path."""
-        return self.path / ".cip"
+        self._ignore_matchers: Optional[Tuple[Optional[Pattern], Optional[Pattern]]] = None
     
     @property
     def has_cip_setup(self) -> bool:
@@ -80,21 +101,28 @@ class RepositoryManager:
         directories = []
         metadata_files = []
         
-        if target_path.exists():
-            for entry in sorted(target_path.iterdir()):
-                # Skip hidden files/directories except specific ones
-                if entry.name.startswith('.') and entry.name not in ['.gitignore', '.cip']:
-                    continue
-                
-                if self.is_ignored(entry):
-                    continue
-                
-                if entry.is_dir():
-                    directories.append(entry.name)
-                else:
-                    files.append(entry.name)
-                    if entry.name in ['meta.yaml', 'map.yaml']:
-                        metadata_files.append(entry.name)
+        # scandir entries carry the file type, so is_dir() needs no extra stat
+        try:
+            with os.scandir(target_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            entries = []
+        
+        for entry in entries:
+            name = entry.name
+            # Skip hidden files/directories except specific ones
+            if name.startswith('.') and name not in ['.gitignore', '.cip']:
+                continue
+            
+            if self.is_ignored(target_path / name):
+                continue
+            
+            if entry.is_dir():
+                directories.append(name)
+            else:
+                files.append(name)
+                if name in ['meta.yaml', 'map.yaml']:
+                    metadata_files.append(name)
         
         structure = DirectoryTree(
             path=target_path,
@@ -122,51 +150,92 @@ class RepositoryManager:
     
     def load_existing_metadata(self) -> Dict[str, Any]:
         """Load existing metadata from various sources."""
-        metadata = {}
-        
-        # Load root meta.yaml
-        root_meta = self.path / "meta.yaml"
-        if root_meta.exists():
-            with open(root_meta, 'r', encoding='utf-8') as f:
-                metadata['root'] = yaml.safe_load(f)
-        
-        # Load .cip/core.yaml
-        cip_config = self.cip_directory / "core.yaml"
-        if cip_config.exists():
-            with open(cip_config, 'r', encoding='utf-8') as f:
-                metadata['config'] = yaml.safe_load(f)
-        
-        # Load map.yaml
-        map_file = self.path / "map.yaml"
-        if map_file.exists():
-            with open(map_file, 'r', encoding='utf-8') as f:
-                metadata['map'] = yaml.safe_load(f)
-        
-        return metadata
+        sources = {
+            'root': self.path / "meta.yaml",
+            'config': self.cip_directory / "core.yaml",
+            'map': self.path / "map.yaml",
+        }
+        
+        # The files are independent, so read them concurrently
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            results = executor.map(self._load_yaml_file, sources.values())
+            return {
+                key: data
+                for key, (found, data) in zip(sources, results)
+                if found
+            }
+    
+    @staticmethod
+    def _load_yaml_file(file_path: Path) -> Tuple[bool, Any]:
+        """Load a YAML file, returning whether it existed and its content."""
+        if not file_path.exists():
+            return False, None
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return True, yaml.safe_load(f)
+    
+    def scan(self) -> RepoScan:
+        """
+        Walk the repository once, collecting the top-level entries and all
+        meta.yaml paths without descending into ignored trees. Returns cached
+        result if available.
+        """
+        if self._scan_cache is not None:
+            return self._scan_cache
+        
+        top_level_dirs = set()
+        top_level_files = set()
+        meta_yaml_paths = []
+        
+        for dirpath, dirnames, filenames in os.walk(self.path):
+            if dirpath == str(self.path):
+                for names, entries in ((dirnames, top_level_dirs), (filenames, top_level_files)):
+                    for name in names:
+                        # Skip hidden files/directories except specific ones
+                        if name.startswith('.') and name not in ['.gitignore', '.cip']:
+                            continue
+                        if not self.is_ignored(self.path / name):
+                            entries.add(name)
+            
+            if 'meta.yaml' in filenames:
+                meta_yaml_paths.append(Path(dirpath) / 'meta.yaml')
+            
+            # Never descend into git internals or ignored trees, but keep a
+            # meta.yaml left at the top of an ignored one so cleanup can flag it
+            subdirs = [Path(dirpath, d) for d in dirnames if d != '.git']
+            dirnames[:] = []
+            for subdir, ignored in zip(subdirs, self.is_ignored_batch(subdirs)):
+                if not ignored:
+                    dirnames.append(subdir.name)
+                elif os.path.isfile(subdir / 'meta.yaml'):
+                    meta_yaml_paths.append(subdir / 'meta.yaml')
+        
+        self._scan_cache = RepoScan(
+            top_level_dirs=frozenset(top_level_dirs),
+            top_level_files=frozenset(top_level_files),
+            meta_yaml_paths=meta_yaml_paths
+        )
+        return self._scan_cache
     
     def detect_project_type(self) -> ProjectType:
         """Detect repository project type based on structure and content."""
-        structure = self.get_directory_structure()
+        scan = self.scan()
+        directories = scan.top_level_dirs
         
         # Check for theory repository indicators
-        theory_indicators = ['experiments', 'theory', 'research', 'papers']
-        if any(name in structure.directories for name in theory_indicators):
+        if directories & _THEORY_INDICATORS:
             return ProjectType.THEORY
         
         # Check for SDK repository indicators
-        sdk_indicators = ['src', 'lib', 'setup.py', 'pyproject.toml', 'package.json']
-        if any(name in structure.files for name in sdk_indicators) or \
-           any(name in structure.directories for name in ['src', 'lib']):
+        if scan.top_level_files & _SDK_FILE_INDICATORS or directories & _SDK_DIR_INDICATORS:
             return ProjectType.SDK
         
         # Check for protocol repository indicators
-        protocol_indicators = ['spec', 'protocol', 'standards']
-        if any(name in structure.directories for name in protocol_indicators):
+        if directories & _PROTOCOL_INDICATORS:
             return ProjectType.PROTOCOL
         
         # Check for devkit indicators
-        devkit_indicators = ['tools', 'devkit', 'development']
-        if any(name in structure.directories for name in devkit_indicators):
+        if directories & _DEVKIT_INDICATORS:
             return ProjectType.DEVKIT
         
         # Default to project
@@ -174,32 +243,58 @@ class RepositoryManager:
     
     def is_ignored(self, path: Path) -> bool:
         """Check if a path should be ignored based on gitignore patterns."""
-        if self._gitignore_patterns is None:
-            self._load_gitignore_patterns()
+        return self._is_ignored(path, self._get_ignore_matchers())
+    
+    def is_ignored_batch(self, paths: Sequence[Path]) -> List[bool]:
+        """
+        Check many paths against the gitignore patterns at once.
         
-        # Get relative path from repo root
+        Equivalent to calling is_ignored on each path, but fetches the
+        compiled patterns only once.
+        """
+        matchers = self._get_ignore_matchers()
+        return [self._is_ignored(path, matchers) for path in paths]
+    
+    def _is_ignored(self, path: Path, matchers: Tuple[Optional[Pattern], Optional[Pattern]]) -> bool:
+        """Match one path against the compiled gitignore expressions."""
         try:
             rel_path = path.relative_to(self.path)
-            path_str = str(rel_path).replace('\\', '/')
         except ValueError:
             # Path is not under repo root
             return True
         
-        # Check against gitignore patterns
-        for pattern in self._gitignore_patterns:
-            if fnmatch.fnmatch(path_str, pattern) or \
-               fnmatch.fnmatch(path.name, pattern):
-                return True
-            
-            # Handle directory patterns
-            if pattern.endswith('/') and path.is_dir():
-                dir_pattern = pattern.rstrip('/')
-                if fnmatch.fnmatch(path_str, dir_pattern) or \
-                   fnmatch.fnmatch(path.name, dir_pattern):
-                    return True
+        any_pattern, dir_pattern = matchers
+        path_str = os.path.normcase(str(rel_path).replace('\\', '/'))
+        name = os.path.normcase(path.name)
         
+        if any_pattern is not None and (any_pattern.match(path_str) or any_pattern.match(name)):
+            return True
+        # Directory patterns ("build/") only apply to directories
+        if dir_pattern is not None and (dir_pattern.match(path_str) or dir_pattern.match(name)):
+            return path.is_dir()
         return False
     
+    def _get_ignore_matchers(self) -> Tuple[Optional[Pattern], Optional[Pattern]]:
+        """Get the compiled gitignore expressions, compiling them on first use."""
+        if self._ignore_matchers is None:
+            self._ignore_matchers = self._compile_ignore_matchers()
+        return self._ignore_matchers
+    
+    def _compile_ignore_matchers(self) -> Tuple[Optional[Pattern], Optional[Pattern]]:
+        """Compile gitignore patterns into one expression for all patterns and one for directory patterns."""
+        if self._gitignore_patterns is None:
+            self._load_gitignore_patterns()
+        
+        def compile_patterns(patterns: List[str]) -> Optional[Pattern]:
+            if not patterns:
+                return None
+            return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+        
+        return (
+            compile_patterns(self._gitignore_patterns),
+            compile_patterns([p.rstrip('/') for p in self._gitignore_patterns if p.endswith('/')])
+        )
+    
     def _load_gitignore_patterns(self) -> None:
         """Load and parse .gitignore patterns."""
         patterns = []
@@ -224,18 +319,19 @@ class RepositoryManager:
             '.pytest_cache',
             '.coverage',
             'htmlcov',
+            '.cip_cache',
         ]
         patterns.extend(default_patterns)
         
         # Load from .gitignore file
         gitignore_path = self.path / '.gitignore'
         if gitignore_path.exists():
-            with open(gitignore_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if line and not line.startswith('#'):
-                        patterns.append(line)
+            content = gitignore_path.read_text(encoding='utf-8')
+            # Skip empty lines and comments
+            patterns.extend(
+                line for line in map(str.strip, content.splitlines())
+                if line and line[0] != '#'
+            )
         
         self._gitignore_patterns = patterns
     
@@ -246,12 +342,68 @@ class RepositoryManager:
         # Ensure directory exists
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(metadata, f, sort_keys=False, allow_unicode=True)
+        # Serialize once and write the bytes, rather than streaming many small text writes
+        data = yaml.dump(metadata, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+        file_path.write_bytes(data.encode('utf-8'))
+        YamlParser.invalidate(file_path)
+    
+    def write_files(self, pending: Iterable[Tuple[Path, bytes]]) -> List[Tuple[Path, str]]:
+        """
+        Write many files in a single pass, grouped by parent directory.
+        
+        Directories are written concurrently, so writes overlap on slow storage.
+        Returns a list of (path, error) pairs for files that could not be written.
+        """
+        groups: Dict[Path, List[Tuple[str, bytes]]] = {}
+        for file_path, data in pending:
+            groups.setdefault(file_path.parent, []).append((file_path.name, data))
+        
+        if len(groups) <= 1:
+            return [failure for parent, entries in groups.items()
+                    for failure in self._write_directory_files(parent, entries)]
+        
+        failures = []
+        with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(groups))) as executor:
+            parents = sorted(groups)
+            for group_failures in executor.map(self._write_directory_files, parents,
+                                               [groups[parent] for parent in parents]):
+                failures.extend(group_failures)
+        
+        return failures
+    
+    @staticmethod
+    def _write_directory_files(parent: Path, entries: List[Tuple[str, bytes]]) -> List[Tuple[Path, str]]:
+        """Write files that share a parent directory, returning any failures."""
+        failures = []
+        dir_fd = None
+        try:
+            if _USE_DIR_FD:
+                dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+            for name, data in entries:
+                try:
+                    fd = os.open(name if dir_fd is not None else parent / name,
+                                 _WRITE_FLAGS, 0o666, dir_fd=dir_fd)
+                    try:
+                        view = memoryview(data)
+                        while view:
+                            view = view[os.write(fd, view):]
+                    finally:
+                        os.close(fd)
+                    # Rewrites within the mtime granularity would otherwise hit a stale parse
+                    YamlParser.invalidate(parent / name)
+                except OSError as e:
+                    failures.append((parent / name, str(e)))
+        except OSError as e:
+            failures.extend((parent / name, str(e)) for name, _ in entries)
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        
+        return failures
     
     def get_all_metadata_files(self) -> List[Path]:
         """Get all metadata files in the repository."""
-        return self.find_files_by_pattern("meta.yaml")
+        return list(self.scan().meta_yaml_paths)
     
     def get_child_directories_and_files(self, path: Optional[Path] = None) -> Tuple[List[str], List[str]]:
         """Get child directories and files for a given path."""
@@ -271,4 +423,6 @@ class RepositoryManager:
         """Clear cached data (useful for testing or after changes)."""
         self._config_cache = None
         self._structure_cache = None
+        self._scan_cache = None
         self._gitignore_patterns = None
+        self._ignore_matchers = None
@@ -7,18 +7,27 @@ This module provides the MetadataEngine that consolidates and replaces:
 - Template generation from schemas
 """
 
-from .engine import MetadataEngine
-from .strategies import (
-    MetadataGenerator,
-    RuleBasedGenerator,
-    AIEnhancedGenerator,
-    HybridGenerator
-)
+from ..utils import lazy_module_attrs
 
 __all__ = [
     "MetadataEngine",
+    "CleanupResult",
     "MetadataGenerator",
     "RuleBasedGenerator", 
     "AIEnhancedGenerator",
     "HybridGenerator",
 ]
+
+
+# Resolved on first access (PEP 562) so importing the package stays cheap
+_LAZY_ATTRIBUTES = {
+    "MetadataEngine": ".engine",
+    "CleanupResult": ".engine",
+    "MetadataGenerator": ".strategies",
+    "RuleBasedGenerator": ".strategies",
+    "AIEnhancedGenerator": ".strategies",
+    "HybridGenerator": ".strategies",
+}
+
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_ATTRIBUTES)
@@ -5,14 +5,145 @@ This module provides the MetadataEngine class that consolidates and replaces
 multiple scattered metadata generators with a unified interface.
 """
 
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field, asdict, is_dataclass
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Callable, Tuple, Mapping, Iterator
 from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import yaml
 
 from ..engine.repository import RepositoryManager
 from ..engine.config import GenerationConfig
+from ..utils import YamlLoader, CACHE_MAX_BYTES, evict_lru, IO_WORKERS
 from .strategies import MetadataGenerator, RuleBasedGenerator, AIEnhancedGenerator, HybridGenerator
 
 
+# Strategies available on every engine
+_BUILTIN_STRATEGIES = {
+    'rule_based': RuleBasedGenerator,
+    'ai_enhanced': AIEnhancedGenerator,
+    'hybrid': HybridGenerator,
+}
+
+# Strategies whose output depends only on the directory tree and configuration
+_CACHEABLE_STRATEGIES = frozenset(['rule_based'])
+
+_STRATEGY_DESCRIPTIONS: Dict[str, str] = {
+    "rule_based": "Template-based generation using directory analysis and predefined rules. Fast and consistent.",
+    "ai_enhanced": "AI-powered generation with intelligent descriptions and semantic analysis. Requires AI provider.",
+    "hybrid": "Combines rule-based consistency with AI enhancement. Uses rules as foundation, AI for improvements."
+}
+
+# Read-only views, so lookups can share them without copying
+_STRATEGY_REQUIREMENTS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "rule_based": MappingProxyType({
+        "ai_provider": False,
+        "internet": False,
+        "dependencies": ()
+    }),
+    "ai_enhanced": MappingProxyType({
+        "ai_provider": True,
+        "internet": True,  # Most AI providers require internet
+        "dependencies": ("AI provider configuration",)
+    }),
+    "hybrid": MappingProxyType({
+        "ai_provider": "optional",
+        "internet": "optional",
+        "dependencies": ("AI provider for enhancement (optional)",)
+    })
+})
+
+_EMPTY_REQUIREMENTS: Mapping[str, Any] = MappingProxyType({})
+
+# Schema versions cleanup accepts
+_SUPPORTED_SCHEMA_VERSIONS = frozenset(('1.0', '2.0'))
+
+# Phrases that mark a description as a placeholder
+_GENERIC_DESCRIPTION_RE = re.compile(r'auto-generated|placeholder|todo', re.IGNORECASE)
+
+# Bump when the cleanup checks change, invalidating stored fingerprints
+_CLEANUP_CODE_VERSION = 1
+
+# Largest meta.yaml cleanup will parse
+_MAX_META_FILE_BYTES = 1024 * 1024
+
+
+def _validate_ai_enhanced(config: GenerationConfig) -> List[str]:
+    """Check the AI enhanced strategy has a usable provider."""
+    errors = []
+    
+    if not config.ai_provider or config.ai_provider == "none":
+        errors.append("AI enhanced strategy requires an AI provider")
+    
+    if config.ai_provider == "ollama" and not config.ai_model:
+        errors.append("Ollama provider requires a model specification")
+    
+    return errors
+
+
+def _validate_hybrid(config: GenerationConfig) -> List[str]:
+    """Check the AI half of the hybrid strategy, if one is configured."""
+    if config.ai_provider == "ollama" and not config.ai_model:
+        return ["Hybrid strategy with Ollama requires a model specification"]
+    return []
+
+
+def _no_validation(config: GenerationConfig) -> List[str]:
+    """Validator for strategies without configuration requirements."""
+    return []
+
+
+# Per-strategy configuration validators, looked up by strategy name
+_BUILTIN_VALIDATORS: Dict[str, Callable[[GenerationConfig], List[str]]] = {
+    'rule_based': _no_validation,
+    'ai_enhanced': _validate_ai_enhanced,
+    'hybrid': _validate_hybrid,
+}
+
+
+def _config_fingerprint(*configs: Any) -> bytes:
+    """Hash configuration objects for use in a cache key."""
+    data = repr([asdict(c) if is_dataclass(c) else c for c in configs]).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _tree_fingerprint(repo: RepositoryManager) -> bytes:
+    """Hash the relative path, mtime and size of every non-ignored entry."""
+    entries = []
+    root = str(repo.root_path)
+    
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not repo.is_ignored(Path(dirpath, d)))
+        for name in dirnames + sorted(filenames):
+            entry_path = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(entry_path, follow_symlinks=False)
+            except OSError:
+                continue
+            rel_path = os.path.relpath(entry_path, root)
+            entries.append(f"{rel_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n")
+    
+    # Hash the whole listing in one call rather than updating per entry
+    data = ''.join(entries).encode('utf-8', 'surrogateescape')
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@dataclass
+class CleanupResult:
+    """Result of a metadata cleanup run."""
+    total_files_checked: int
+    files_to_remove: List[str]
+    files_with_issues: List[Dict[str, Any]]
+    dry_run: bool
+    files_actually_removed: int = 0
+    removal_errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
 class MetadataEngine:
     """
     Unified system for all metadata generation.
@@ -37,11 +168,37 @@ class MetadataEngine:
         """
         self.repo = repo
         self.engine_config = engine_config
-        self.generators: Dict[str, MetadataGenerator] = {
-            'rule_based': RuleBasedGenerator(engine_config),
-            'ai_enhanced': AIEnhancedGenerator(engine_config),
-            'hybrid': HybridGenerator(engine_config)
+        
+        # Generators are constructed on first use, since a run normally needs one
+        self._factories: Dict[str, Callable[[], MetadataGenerator]] = {
+            name: partial(generator_class, engine_config)
+            for name, generator_class in _BUILTIN_STRATEGIES.items()
         }
+        self._instances: Dict[str, MetadataGenerator] = {}
+        
+        # Known from the class, so previews don't need to construct a generator
+        self._preview_caps: Dict[str, bool] = {
+            name: hasattr(generator_class, '_generate_directory_metadata')
+            for name, generator_class in _BUILTIN_STRATEGIES.items()
+        }
+        self._validators: Dict[str, Callable[[GenerationConfig], List[str]]] = dict(_BUILTIN_VALIDATORS)
+        self._cache_dir = repo.root_path / '.cip_cache' / 'generation'
+        self._cleanup_cache_file = repo.root_path / '.cip_cache' / 'cleanup_fingerprint.json'
+    
+    @property
+    def generators(self) -> Dict[str, MetadataGenerator]:
+        """Get all registered generators, constructing any not yet created."""
+        return {name: self._get(name) for name in self._factories}
+    
+    def _get(self, strategy: str) -> Optional[MetadataGenerator]:
+        """Get the generator for a strategy, or None if it is not registered."""
+        generator = self._instances.get(strategy)
+        if generator is None:
+            factory = self._factories.get(strategy)
+            if factory is None:
+                return None
+            generator = self._instances[strategy] = factory()
+        return generator
     
     def generate(self, strategy: str, config: GenerationConfig) -> 'GenerationResult':
         """
@@ -57,25 +214,119 @@ class MetadataEngine:
         Raises:
             ValueError: If strategy is not available
         """
-        if strategy not in self.generators:
-            raise ValueError(f"Unknown generation strategy: {strategy}. Available: {list(self.generators.keys())}")
+        generator = self._get(strategy)
+        if generator is None:
+            raise ValueError(f"Unknown generation strategy: {strategy}. Available: {list(self._factories)}")
+        
+        # Deterministic strategies are memoized on disk by tree and config
+        use_cache = (config.use_cache and not config.force_overwrite
+                     and strategy in _CACHEABLE_STRATEGIES)
+        if use_cache:
+            cached = self._load_cached_result(self._cache_key(strategy, config))
+            if cached is not None:
+                return cached
+        
+        result = generator.generate(self.repo, config)
+        
+        # Generated files change the tree, so drop cached repository scans
+        self.repo.clear_cache()
+        
+        if use_cache and result.success:
+            self._store_cached_result(self._cache_key(strategy, config), result)
+        return result
+    
+    def generate_iter(self, strategy: str, config: GenerationConfig) -> Iterator['DirectoryResult']:
+        """
+        Generate metadata, yielding one DirectoryResult per directory.
+        
+        Each directory's metadata is written before its result is yielded,
+        so callers can drop results as they go instead of holding the whole
+        tree in memory. Results are not cached.
+        
+        Raises:
+            ValueError: If strategy is not available
+        """
+        generator = self._get(strategy)
+        if generator is None:
+            raise ValueError(f"Unknown generation strategy: {strategy}. Available: {list(self._factories)}")
+        
+        # Validated above, before the first result is requested
+        return self._generate_iter(generator, config)
+    
+    def _generate_iter(self, generator: MetadataGenerator, config: GenerationConfig) -> Iterator['DirectoryResult']:
+        """Stream a generator's results, dropping cached repository scans afterwards."""
+        try:
+            yield from generator.generate_iter(self.repo, config)
+        finally:
+            # Generated files change the tree, so drop cached repository scans
+            self.repo.clear_cache()
+    
+    def _cache_key(self, strategy: str, config: GenerationConfig) -> str:
+        """Build the generation cache key for the current repository tree."""
+        return hashlib.blake2b(b'|'.join([
+            strategy.encode('utf-8'),
+            _config_fingerprint(config, self.engine_config),
+            _tree_fingerprint(self.repo),
+        ]), digest_size=16).hexdigest()
+    
+    def _load_cached_result(self, key: str) -> Optional['GenerationResult']:
+        """Load a cached generation result, or None on a miss."""
+        from ..engine.core import GenerationResult
+        
+        cache_file = self._cache_dir / f"{key}.json"
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Refresh mtime so eviction drops least recently used entries
+            os.utime(cache_file)
+            return GenerationResult(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    def _store_cached_result(self, key: str, result: 'GenerationResult') -> None:
+        """
+        Store a generation result keyed on the tree it produced.
         
-        generator = self.generators[strategy]
-        return generator.generate(self.repo, config)
+        Re-running over that tree writes nothing, so the stored result has
+        empty file lists.
+        """
+        data = asdict(result)
+        data['files_created'] = []
+        data['files_updated'] = []
+        
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self._cache_dir / f"{key}.json"
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, cache_file)
+            evict_lru(self._cache_dir, CACHE_MAX_BYTES)
+        except (OSError, TypeError, ValueError):
+            # Caching is best effort; generation already succeeded
+            pass
     
     def get_available_strategies(self) -> List[str]:
         """Get list of available generation strategies."""
-        return list(self.generators.keys())
+        return list(self._factories)
     
-    def register_strategy(self, name: str, generator: MetadataGenerator) -> None:
+    def register_strategy(self, name: str, generator: MetadataGenerator,
+                          validator: Optional[Callable[[GenerationConfig], List[str]]] = None) -> None:
         """
         Register a custom generation strategy.
         
         Args:
             name: Strategy name
             generator: Generator implementation
+            validator: Optional callable returning configuration errors for the strategy
         """
-        self.generators[name] = generator
+        self._factories[name] = lambda: generator
+        self._instances[name] = generator
+        self._preview_caps[name] = hasattr(generator, '_generate_directory_metadata')
+        if validator is not None:
+            self._validators[name] = validator
+        else:
+            self._validators.pop(name, None)
     
     def validate_strategy_config(self, strategy: str, config: GenerationConfig) -> List[str]:
         """
@@ -90,23 +341,12 @@ class MetadataEngine:
         """
         errors = []
         
-        if strategy not in self.generators:
+        if strategy not in self._factories:
             errors.append(f"Unknown strategy: {strategy}")
             return errors
         
         # Strategy-specific validation
-        if strategy == "ai_enhanced":
-            if not config.ai_provider or config.ai_provider == "none":
-                errors.append("AI enhanced strategy requires an AI provider")
-            
-            if config.ai_provider == "ollama" and not config.ai_model:
-                errors.append("Ollama provider requires a model specification")
-        
-        elif strategy == "hybrid":
-            if config.ai_provider and config.ai_provider != "none":
-                # Validate AI config for hybrid mode
-                if config.ai_provider == "ollama" and not config.ai_model:
-                    errors.append("Hybrid strategy with Ollama requires a model specification")
+        errors.extend(self._validators.get(strategy, _no_validation)(config))
         
         return errors
     
@@ -120,11 +360,10 @@ class MetadataEngine:
         Returns:
             Dictionary with strategy information
         """
-        if strategy not in self.generators:
+        generator = self._get(strategy)
+        if generator is None:
             return {"error": f"Unknown strategy: {strategy}"}
         
-        generator = self.generators[strategy]
-        
         info = {
             "name": strategy,
             "strategy_name": generator.get_strategy_name(),
@@ -136,33 +375,11 @@ class MetadataEngine:
     
     def _get_strategy_description(self, strategy: str) -> str:
         """Get description for a strategy."""
-        descriptions = {
-            "rule_based": "Template-based generation using directory analysis and predefined rules. Fast and consistent.",
-            "ai_enhanced": "AI-powered generation with intelligent descriptions and semantic analysis. Requires AI provider.",
-            "hybrid": "Combines rule-based consistency with AI enhancement. Uses rules as foundation, AI for improvements."
-        }
-        return descriptions.get(strategy, "Custom strategy")
+        return _STRATEGY_DESCRIPTIONS.get(strategy, "Custom strategy")
     
-    def _get_strategy_requirements(self, strategy: str) -> Dict[str, Any]:
-        """Get requirements for a strategy."""
-        requirements = {
-            "rule_based": {
-                "ai_provider": False,
-                "internet": False,
-                "dependencies": []
-            },
-            "ai_enhanced": {
-                "ai_provider": True,
-                "internet": True,  # Most AI providers require internet
-                "dependencies": ["AI provider configuration"]
-            },
-            "hybrid": {
-                "ai_provider": "optional",
-                "internet": "optional",
-                "dependencies": ["AI provider for enhancement (optional)"]
-            }
-        }
-        return requirements.get(strategy, {})
+    def _get_strategy_requirements(self, strategy: str) -> Mapping[str, Any]:
+        """Get requirements for a strategy (read-only)."""
+        return _STRATEGY_REQUIREMENTS.get(strategy, _EMPTY_REQUIREMENTS)
     
     def generate_preview(self, strategy: str, config: GenerationConfig, path: Optional[Path] = None) -> Dict[str, Any]:
         """
@@ -176,16 +393,15 @@ class MetadataEngine:
         Returns:
             Preview of metadata that would be generated
         """
-        if strategy not in self.generators:
+        if strategy not in self._factories:
             return {"error": f"Unknown strategy: {strategy}"}
         
-        generator = self.generators[strategy]
         target_path = path or self.repo.root_path
         
         try:
-            if hasattr(generator, '_generate_directory_metadata'):
+            if self._preview_caps[strategy]:
                 # For backwards compatibility with strategy implementations
-                preview_metadata = generator._generate_directory_metadata(self.repo, target_path)
+                preview_metadata = self._get(strategy)._generate_directory_metadata(self.repo, target_path)
             else:
                 # For custom generators, we'd need a preview method
                 preview_metadata = {"error": "Preview not available for this strategy"}
@@ -200,6 +416,85 @@ class MetadataEngine:
         except Exception as e:
             return {"error": f"Preview generation failed: {str(e)}"}
     
+    def _inspect_metadata_file(self, meta_file: Path,
+                               known_clean: Dict[str, List[int]]) -> Tuple[List[str], Optional[List[int]]]:
+        """
+        Check a metadata file's content.
+        
+        Args:
+            meta_file: Metadata file to check
+            known_clean: Fingerprints of files that had no issues last time
+            
+        Returns:
+            Tuple of (issues found, [mtime_ns, size] fingerprint or None)
+        """
+        try:
+            stat = meta_file.stat()
+        except OSError as e:
+            return [f"Parse error: {str(e)}"], None
+        
+        # Unchanged since a clean check, so skip the parse
+        fingerprint = [stat.st_mtime_ns, stat.st_size]
+        if known_clean.get(str(meta_file)) == fingerprint:
+            return [], fingerprint
+        
+        return self._check_metadata_content(meta_file, stat.st_size), fingerprint
+    
+    def _check_metadata_content(self, meta_file: Path, size: int) -> List[str]:
+        """Parse a metadata file and return the issues found."""
+        try:
+            # Metadata files are small; don't parse anything unreasonably large
+            if size > _MAX_META_FILE_BYTES:
+                return [f"File exceeds {_MAX_META_FILE_BYTES} bytes"]
+            
+            # Let the YAML loader handle decoding of the raw bytes
+            metadata = yaml.load(meta_file.read_bytes(), Loader=YamlLoader) or {}
+            
+            # Check for issues
+            issues = []
+            
+            # Check schema version
+            if 'schema_version' not in metadata:
+                issues.append("Missing schema_version")
+            elif metadata['schema_version'] not in _SUPPORTED_SCHEMA_VERSIONS:
+                issues.append(f"Unsupported schema version: {metadata['schema_version']}")
+            
+            # Check for empty or generic descriptions
+            if 'description' in metadata:
+                if _GENERIC_DESCRIPTION_RE.search(metadata['description']):
+                    issues.append("Generic description")
+            
+            return issues
+            
+        except Exception as e:
+            return [f"Parse error: {str(e)}"]
+    
+    def _load_cleanup_fingerprints(self) -> Dict[str, List[int]]:
+        """Load fingerprints of files the last cleanup found clean."""
+        try:
+            with open(self._cleanup_cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        # Results from older cleanup rules can't be trusted
+        if not isinstance(data, dict) or data.get('code_version') != _CLEANUP_CODE_VERSION:
+            return {}
+        return data.get('files', {})
+    
+    def _save_cleanup_fingerprints(self, fingerprints: Dict[str, List[int]]) -> None:
+        """Persist fingerprints of clean files for the next cleanup."""
+        data = {'code_version': _CLEANUP_CODE_VERSION, 'files': fingerprints}
+        try:
+            self._cleanup_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._cleanup_cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self._cleanup_cache_file)
+        except OSError:
+            # Fingerprints are only an optimization
+            pass
+    
     def cleanup_metadata(self, dry_run: bool = True) -> Dict[str, Any]:
         """
         Clean up outdated or invalid metadata files.
@@ -208,68 +503,61 @@ class MetadataEngine:
             dry_run: If True, return what would be cleaned without doing it
             
         Returns:
-            Summary of cleanup actions
+            Summary of cleanup actions, as a dict of CleanupResult fields
         """
         all_meta_files = self.repo.get_all_metadata_files()
         
         files_to_remove = []
         files_with_issues = []
         
-        for meta_file in all_meta_files:
-            try:
-                with open(meta_file, 'r', encoding='utf-8') as f:
-                    import yaml
-                    metadata = yaml.safe_load(f)
-                
-                # Check for issues
-                issues = []
-                
-                # Check schema version
-                if 'schema_version' not in metadata:
-                    issues.append("Missing schema_version")
-                elif metadata['schema_version'] not in ['1.0', '2.0']:
-                    issues.append(f"Unsupported schema version: {metadata['schema_version']}")
-                
-                # Check for empty or generic descriptions
-                if 'description' in metadata:
-                    desc = metadata['description'].lower()
-                    if any(phrase in desc for phrase in ['auto-generated', 'placeholder', 'todo']):
-                        issues.append("Generic description")
-                
-                # Check if directory still exists
-                meta_dir = meta_file.parent
-                if not meta_dir.exists() or self.repo.is_ignored(meta_dir):
-                    files_to_remove.append(str(meta_file))
-                
+        # Metadata left in removed or ignored directories is stale; sort it
+        # out with cheap stat/pattern checks so only live files get parsed
+        meta_dirs = [meta_file.parent for meta_file in all_meta_files]
+        ignored_dirs = self.repo.is_ignored_batch(meta_dirs)
+        live_files = []
+        for meta_file, meta_dir, ignored in zip(all_meta_files, meta_dirs, ignored_dirs):
+            if ignored or not os.path.isdir(meta_dir):
+                files_to_remove.append(str(meta_file))
+            else:
+                live_files.append(meta_file)
+        
+        known_clean = self._load_cleanup_fingerprints()
+        clean_fingerprints = {}
+        
+        # Each file is independent, so inspect them on a thread pool
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            inspections = executor.map(partial(self._inspect_metadata_file, known_clean=known_clean), live_files)
+            
+            for meta_file, (issues, fingerprint) in zip(live_files, inspections):
                 if issues:
                     files_with_issues.append({
                         "file": str(meta_file),
                         "issues": issues
                     })
-                    
-            except Exception as e:
-                files_with_issues.append({
-                    "file": str(meta_file),
-                    "issues": [f"Parse error: {str(e)}"]
-                })
-        
-        result = {
-            "total_files_checked": len(all_meta_files),
-            "files_to_remove": files_to_remove,
-            "files_with_issues": files_with_issues,
-            "dry_run": dry_run
-        }
+                elif fingerprint is not None:
+                    clean_fingerprints[str(meta_file)] = fingerprint
+        
+        self._save_cleanup_fingerprints(clean_fingerprints)
+        
+        result = CleanupResult(
+            total_files_checked=len(all_meta_files),
+            files_to_remove=files_to_remove,
+            files_with_issues=files_with_issues,
+            dry_run=dry_run
+        )
         
         # Actually remove files if not dry run
         if not dry_run:
-            removed_count = 0
-            for file_path in files_to_remove:
-                try:
-                    Path(file_path).unlink()
-                    removed_count += 1
-                except Exception as e:
-                    result[f"removal_error_{file_path}"] = str(e)
+            # Overlap the unlink syscalls; paths are already plain strings
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {executor.submit(os.unlink, file_path): file_path for file_path in files_to_remove}
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        result.files_actually_removed += 1
+                    except Exception as e:
+                        result.removal_errors.append((futures[future], str(e)))
             
-            result["files_actually_removed"] = removed_count
+            self.repo.clear_cache()
         
-        return result
+        return asdict(result)
@@ -6,12 +6,164 @@ that replace the old DirectoryMetadataGenerator and AIEnhancedDirectoryMetadataG
 """
 
 from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Iterator
+import os
+import re
 import yaml
 
-from ..engine.repository import RepositoryManager
+from ..engine.repository import RepositoryManager, DirectoryTree
 from ..engine.config import GenerationConfig
+from ..utils import YamlParser, YamlDumper, IO_WORKERS
+
+
+# File extensions that mark a directory as holding code, docs or configuration
+_CODE_EXTENSIONS = frozenset(['.py', '.js', '.ts', '.java', '.cpp', '.c'])
+_DOC_EXTENSIONS = frozenset(['.md', '.rst', '.txt'])
+_CONFIG_EXTENSIONS = frozenset(['.yaml', '.yml', '.json', '.toml', '.ini'])
+
+# Semantic scope keywords for common directory names
+_SCOPE_MAP: Dict[str, Tuple[str, ...]] = {
+    'src': ('source_code', 'implementation'),
+    'lib': ('library', 'modules'),
+    'tests': ('testing', 'quality_assurance'),
+    'docs': ('documentation', 'guides'),
+    'documentation': ('documentation', 'guides'),
+    'examples': ('examples', 'demonstrations'),
+    'samples': ('examples', 'demonstrations'),
+    'tools': ('tools', 'utilities'),
+    'utils': ('utilities', 'helpers'),
+    'utilities': ('utilities', 'helpers'),
+    'scripts': ('automation', 'scripts'),
+    'automation': ('automation', 'workflows'),
+    'config': ('configuration', 'settings'),
+    'configuration': ('configuration', 'settings'),
+    'data': ('data', 'datasets'),
+    'datasets': ('data', 'datasets'),
+    'models': ('models', 'ai_ml'),
+    'experiments': ('experiments', 'research'),
+    'research': ('research', 'investigation'),
+    'theory': ('theory', 'concepts'),
+    'specs': ('specifications', 'standards'),
+    'specification': ('specifications', 'standards'),
+    'protocol': ('protocol', 'standards'),
+    'api': ('api', 'interface'),
+    'interface': ('interface', 'api'),
+    'ui': ('user_interface', 'frontend'),
+    'frontend': ('frontend', 'user_interface'),
+    'backend': ('backend', 'server'),
+    'server': ('server', 'backend'),
+    'database': ('database', 'storage'),
+    'storage': ('storage', 'persistence'),
+    'cache': ('cache', 'performance'),
+    'logs': ('logging', 'monitoring'),
+    'monitoring': ('monitoring', 'observability'),
+    'security': ('security', 'authentication'),
+    'auth': ('authentication', 'security'),
+    'deploy': ('deployment', 'infrastructure'),
+    'deployment': ('deployment', 'infrastructure'),
+    'infrastructure': ('infrastructure', 'deployment'),
+    'docker': ('containerization', 'deployment'),
+    'kubernetes': ('orchestration', 'deployment'),
+    'ci': ('continuous_integration', 'automation'),
+    'cd': ('continuous_deployment', 'automation'),
+    'workflows': ('workflows', 'automation'),
+    'github': ('version_control', 'collaboration'),
+    'git': ('version_control', 'source_control'),
+    'cip': ('cip_protocol', 'cognition_index'),
+    'cognition': ('cognition_index', 'cip_protocol'),
+    'test': ('testing', 'validation'),
+    'testing': ('testing', 'validation'),
+    'validation': ('validation', 'testing'),
+    'demo': ('demonstration', 'examples'),
+    'demonstration': ('demonstration', 'examples'),
+}
+
+
+# Descriptions for well-known directory names, matched exactly
+_EXACT_DESCRIPTIONS: Dict[str, str] = {
+    'cli': "The {dirname} directory contains the command line interface for the cip_core package. It is a Python package with an __init__.py file that serves as the entry point for the CLI. The main.py file is the primary script that implements the CLI, and it is executed when the user runs the CLI command from the command line.",
+    'engine': "The {dirname} directory contains the core engine components for the CIP system. This includes the main execution engine, metadata processing, and orchestration logic that coordinates all CIP operations.",
+    'generation': "The {dirname} directory houses the metadata generation strategies and algorithms. It contains different generation approaches including rule-based, AI-enhanced, and hybrid strategies for creating directory metadata.",
+    'validation': "The {dirname} directory contains the validation framework for CIP compliance. It includes schema validators, compliance checkers, and quality assessment tools that ensure repositories meet CIP standards.",
+    'schemas': "The {dirname} directory defines the data schemas and validation rules for CIP metadata. It contains YAML schema definitions and validation logic for meta.yaml files and other CIP structures.",
+    'utils': "The {dirname} directory provides utility functions and helper modules used throughout the CIP codebase. It contains common functionality for file operations, data processing, and system interactions.",
+}
+
+# Descriptions for directories whose name contains one of the keywords, checked in order
+_KEYWORD_DESCRIPTIONS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (('cognition',), "The {dirname} directory implements the Cognition Index Protocol (CIP) validation framework. It contains validation questions, answers, and assessment tools that test AI comprehension of the repository contents."),
+    (('docs', 'documentation'), "The {dirname} directory contains project documentation, user guides, and reference materials. It serves as the central hub for all written materials that help users understand and work with the project."),
+    (('test', 'testing'), "The {dirname} directory contains test suites and testing utilities for {primary_scope}. It includes unit tests, integration tests, and test fixtures to ensure code quality and reliability."),
+    (('experiments', 'research'), "The {dirname} directory contains experimental code and research materials for {primary_scope}. It houses exploratory work, prototypes, and research findings that may inform future development."),
+    (('tools', 'scripts'), "The {dirname} directory contains utility tools and scripts for {primary_scope}. It provides helpful automation, build tools, and administrative scripts for development and maintenance."),
+    (('temp', 'tmp'), "The {dirname} directory serves as temporary storage for {primary_scope} operations. It contains transient files, intermediate results, and temporary data that supports ongoing work."),
+)
+
+# Finds every keyword in one pass; the lookahead also catches overlapping
+# keywords, and each group is named after its index in _KEYWORD_DESCRIPTIONS
+_KEYWORD_RE = re.compile('(?=(?:%s))' % '|'.join(
+    '(?P<k%d>%s)' % (index, '|'.join(map(re.escape, keywords)))
+    for index, (keywords, _) in enumerate(_KEYWORD_DESCRIPTIONS)
+))
+
+# Descriptions for documentation directories with a README, keyed by lowercase name
+_README_DESCRIPTIONS: Dict[str, str] = {
+    'case-studies': "The {dirname} directory contains comprehensive case studies demonstrating real-world CIP implementations. It includes detailed technical analyses, performance benchmarks, success stories, and practical integration results from AI assistants like Claude and GitHub Copilot, providing valuable insights for developers and researchers.",
+    'examples': "The {dirname} directory provides practical guides and step-by-step tutorials for using CIP effectively. It contains hands-on examples for common use cases, from basic setup to advanced automation workflows, repository configurations, and AI integration scenarios.",
+    'reference': "The {dirname} directory provides technical reference documentation including schema definitions, validation rules, file formats, and quick lookup tables. It serves as the authoritative source for CIP specifications, configuration options, and implementation details.",
+    'user-guide': "The {dirname} directory contains comprehensive user documentation covering daily usage of CIP from installation to advanced configuration. It includes getting started guides, CLI reference, configuration options, and troubleshooting resources for developers and teams.",
+    'scripts': "The {dirname} directory documents automation scripts and integration tools that make CIP easier to use across different environments. It provides comprehensive documentation for initialization scripts, maintenance utilities, and CI/CD integration templates.",
+}
+
+# Descriptions chosen from a directory's contents when its name gives no hint
+_CONTENT_DESCRIPTIONS: Dict[str, str] = {
+    'case_studies_ai': "The {dirname} directory contains comprehensive case studies demonstrating real-world CIP implementations. It includes detailed technical analyses of AI assistant integrations, performance benchmarks, and practical success stories from various environments including Claude, GitHub Copilot, and community implementations.",
+    'case_studies_integration': "The {dirname} directory documents real-world implementations and integration results from CIP deployments. It provides detailed case studies, performance metrics, and lessons learned from practical applications across different environments and use cases.",
+    'case_studies': "The {dirname} directory contains real-world case studies and implementation examples. It documents practical applications, success stories, and lessons learned from using the system in different scenarios.",
+    'python_tests': "The {dirname} directory contains test modules and testing utilities for the {primary_scope} functionality. It includes unit tests, integration tests, and test fixtures to ensure code quality and reliability.",
+    'python_package': "The {dirname} directory is a Python package containing {primary_scope} modules and functionality. It provides a structured collection of related code organized for easy import and use.",
+    'python_modules': "The {dirname} directory contains Python modules implementing {primary_scope} functionality. It houses the core logic and implementation details for this component of the system.",
+    'readme': "The {dirname} directory contains documentation and readme files for {primary_scope}. It provides essential information, guides, and reference materials to help users understand and work with this component.",
+    'guides': "The {dirname} directory contains user guides and tutorials for {primary_scope}. It includes step-by-step instructions, examples, and educational materials for users and developers.",
+    'specs': "The {dirname} directory contains specifications and standards documentation for {primary_scope}. It houses formal definitions, requirements, and technical specifications.",
+    'docs': "The {dirname} directory contains documentation and reference materials for {primary_scope}. It includes explanatory documents that help users understand and work with this component.",
+    'config': "The {dirname} directory contains configuration and metadata files for {primary_scope}. It houses YAML definitions, configuration templates, and structured data that define system behavior.",
+    'container': "The {dirname} directory organizes {primary_scope} components into logical subdirectories. It serves as a container for related functionality, with each subdirectory focusing on specific aspects of {primary_scope}.",
+    'reserved': "The {dirname} directory is reserved for {primary_scope} functionality. It provides a dedicated space for organizing related files and components.",
+}
+
+
+@lru_cache(maxsize=1024)
+def _semantic_scope(dirname: str) -> Tuple[str, ...]:
+    """Map a directory name to its semantic scope; names repeat across a tree, so results are cached."""
+    # Handle compound directory names like "cip-test-repo"
+    if '-' in dirname or '_' in dirname:
+        # Split on common separators and get scope for each part
+        parts = dirname.lower().replace('-', ' ').replace('_', ' ').split()
+        all_scopes = []
+        for part in parts:
+            all_scopes.extend(_SCOPE_MAP.get(part, (part,)))
+        return tuple(dict.fromkeys(all_scopes))  # Remove duplicates, keeping order
+    
+    return _SCOPE_MAP.get(dirname.lower(), (dirname,))
+
+
+def _metadata_score(meta: Dict[str, Any]) -> float:
+    """Score a single directory's metadata by the fields it fills in."""
+    score = 0
+    if len(meta.get('description', '')) > 20:
+        score += 0.3
+    if meta.get('semantic_scope'):
+        score += 0.3
+    if meta.get('files'):
+        score += 0.2
+    if 'child_directories' in meta:
+        score += 0.2
+    return score
 
 
 class MetadataGenerator(ABC):
@@ -25,6 +177,8 @@ class MetadataGenerator(ABC):
     def __init__(self, engine_config=None):
         """Initialize with optional engine configuration."""
         self.engine_config = engine_config
+        # Directory listings reused for the rest of a generation run
+        self._structure_cache: Dict[Path, DirectoryTree] = {}
     
     @abstractmethod
     def generate(self, repo: RepositoryManager, config: GenerationConfig) -> 'GenerationResult':
@@ -36,83 +190,117 @@ class MetadataGenerator(ABC):
         """Get the name of this generation strategy."""
         pass
     
+    def generate_iter(self, repo: RepositoryManager, config: GenerationConfig) -> Iterator['DirectoryResult']:
+        """
+        Generate metadata, yielding one result per directory as it is written.
+        
+        Strategies that need the whole tree before producing output fall back
+        to running generate() and splitting its result per directory; errors
+        not tied to a directory are yielded with an empty key.
+        """
+        from ..engine.core import DirectoryResult
+        
+        result = self.generate(repo, config)
+        created = set(result.files_created)
+        updated = set(result.files_updated)
+        
+        for key, metadata in result.metadata.items():
+            directory = repo.root_path if key == 'root' else repo.root_path / key
+            meta_path = str(directory / "meta.yaml")
+            status = "created" if meta_path in created else "updated" if meta_path in updated else None
+            yield DirectoryResult(key=key, meta_path=meta_path, metadata=metadata, status=status)
+        
+        for error in result.errors:
+            yield DirectoryResult(key='', meta_path='', error=error)
+    
     def _get_semantic_scope(self, dirname: str) -> List[str]:
         """Get semantic scope for directory based on name."""
-        # Enhanced semantic scope mapping
-        scope_map = {
-            'src': ['source_code', 'implementation'],
-            'lib': ['library', 'modules'],
-            'tests': ['testing', 'quality_assurance'],
-            'test': ['testing', 'quality_assurance'],
-            'docs': ['documentation', 'guides'],
-            'documentation': ['documentation', 'guides'],
-            'examples': ['examples', 'demonstrations'],
-            'samples': ['examples', 'demonstrations'],
-            'tools': ['tools', 'utilities'],
-            'utils': ['utilities', 'helpers'],
-            'utilities': ['utilities', 'helpers'],
-            'scripts': ['automation', 'scripts'],
-            'automation': ['automation', 'workflows'],
-            'config': ['configuration', 'settings'],
-            'configuration': ['configuration', 'settings'],
-            'data': ['data', 'datasets'],
-            'datasets': ['data', 'datasets'],
-            'models': ['models', 'ai_ml'],
-            'experiments': ['experiments', 'research'],
-            'research': ['research', 'investigation'],
-            'theory': ['theory', 'concepts'],
-            'specs': ['specifications', 'standards'],
-            'specification': ['specifications', 'standards'],
-            'protocol': ['protocol', 'standards'],
-            'api': ['api', 'interface'],
-            'interface': ['interface', 'api'],
-            'ui': ['user_interface', 'frontend'],
-            'frontend': ['frontend', 'user_interface'],
-            'backend': ['backend', 'server'],
-            'server': ['server', 'backend'],
-            'database': ['database', 'storage'],
-            'storage': ['storage', 'persistence'],
-            'cache': ['cache', 'performance'],
-            'logs': ['logging', 'monitoring'],
-            'monitoring': ['monitoring', 'observability'],
-            'security': ['security', 'authentication'],
-            'auth': ['authentication', 'security'],
-            'deploy': ['deployment', 'infrastructure'],
-            'deployment': ['deployment', 'infrastructure'],
-            'infrastructure': ['infrastructure', 'deployment'],
-            'docker': ['containerization', 'deployment'],
-            'kubernetes': ['orchestration', 'deployment'],
-            'ci': ['continuous_integration', 'automation'],
-            'cd': ['continuous_deployment', 'automation'],
-            'workflows': ['workflows', 'automation'],
-            'github': ['version_control', 'collaboration'],
-            'git': ['version_control', 'source_control'],
-            'cip': ['cip_protocol', 'cognition_index'],
-            'cognition': ['cognition_index', 'cip_protocol'],
-            'test': ['testing', 'validation'],
-            'testing': ['testing', 'validation'],
-            'validation': ['validation', 'testing'],
-            'demo': ['demonstration', 'examples'],
-            'demonstration': ['demonstration', 'examples'],
-        }
+        # Copy so callers can't modify the cached scope
+        return list(_semantic_scope(dirname))
+    
+    def _get_structure(self, repo: RepositoryManager, path: Path) -> DirectoryTree:
+        """Get the listing of a directory, scanning it at most once per run."""
+        structure = self._structure_cache.get(path)
+        if structure is None:
+            structure = self._structure_cache[path] = repo.get_directory_structure(path)
+        return structure
+    
+    @staticmethod
+    def _dump_metadata(metadata: Dict[str, Any]) -> bytes:
+        """Serialize metadata exactly as it would be written to meta.yaml."""
+        return yaml.dump(metadata, Dumper=YamlDumper, sort_keys=False, allow_unicode=True).encode('utf-8')
+    
+    def _write_metadata(self, meta_path: Path, metadata: Dict[str, Any], config: GenerationConfig,
+                        defer: bool = False) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Write metadata to meta_path unless it exists and overwriting is off.
+        
+        Files whose content would not change are left alone. With defer set,
+        the serialized content is returned for the caller to write instead.
+        
+        Returns:
+            ("created" or "updated", or None if nothing is written; deferred content or None)
+        """
+        existed = meta_path.exists()
+        if existed and not config.force_overwrite:
+            return None, None
+        
+        data = self._dump_metadata(metadata)
+        if existed:
+            try:
+                if meta_path.read_bytes() == data:
+                    return None, None
+            except OSError:
+                pass
+        
+        status = "updated" if existed else "created"
+        if defer:
+            return status, data
+        
+        # Write to a sibling file and swap it in, so readers never see a partial file
+        tmp_path = meta_path.with_name(meta_path.name + '.tmp')
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, meta_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        YamlParser.invalidate(meta_path)
+        
+        return status, None
+    
+    def _collect_subdirectories(self, repo: RepositoryManager) -> List[Tuple[Path, str]]:
+        """
+        List every non-ignored directory below the root, in depth-first order.
+        
+        Each directory comes with its path relative to the root, built up
+        from the parent's so no path arithmetic is needed per directory.
+        """
+        if repo.is_ignored(repo.root_path):
+            return []
+        
+        subdirs = []
+        stack = [(repo.root_path, '')]
+        while stack:
+            path, key = stack.pop()
+            if key:
+                subdirs.append((path, key))
+            try:
+                structure = self._get_structure(repo, path)
+            except OSError:
+                # Reported when the directory itself is processed
+                continue
+            # Listings already exclude ignored entries
+            prefix = key + os.sep if key else ''
+            stack.extend((path / dirname, prefix + dirname) for dirname in reversed(structure.directories))
         
-        # Handle compound directory names like "cip-test-repo"
-        if '-' in dirname or '_' in dirname:
-            # Split on common separators and get scope for each part
-            parts = dirname.lower().replace('-', ' ').replace('_', ' ').split()
-            all_scopes = []
-            for part in parts:
-                if part in scope_map:
-                    all_scopes.extend(scope_map[part])
-                else:
-                    all_scopes.append(part)
-            return list(set(all_scopes))  # Remove duplicates
-        
-        return scope_map.get(dirname.lower(), [dirname])
-    
-    def _get_child_dirs_and_files(self, repo: RepositoryManager, path: Path) -> Tuple[List[str], List[str]]:
+        return subdirs
+    
+    def _get_child_dirs_and_files(self, repo: RepositoryManager, path: Path,
+                                  structure: Optional[DirectoryTree] = None) -> Tuple[List[str], List[str]]:
         """Get child directories and files, excluding ignored items."""
-        structure = repo.get_directory_structure(path)
+        if structure is None:
+            structure = repo.get_directory_structure(path)
         
         # Filter out meta.yaml from files list since we don't want to include it in the metadata
         files = [f for f in structure.files if f != 'meta.yaml']
@@ -139,87 +327,92 @@ class RuleBasedGenerator(MetadataGenerator):
         """Generate rule-based metadata for the entire repository."""
         from ..engine.core import GenerationResult
         
-        files_created = []
-        files_updated = []
-        errors = []
-        all_metadata = {}
+        if not config.batch_writes:
+            return GenerationResult.from_iter(self.generate_iter(repo, config))
         
-        try:
-            # Process root directory
-            root_metadata = self._generate_directory_metadata(repo, repo.root_path)
-            root_meta_path = repo.root_path / "meta.yaml"
-            
-            if not root_meta_path.exists() or config.force_overwrite:
-                repo.save_metadata(root_metadata, "meta.yaml")
-                if root_meta_path.exists():
-                    files_updated.append(str(root_meta_path))
-                else:
-                    files_created.append(str(root_meta_path))
-            
-            all_metadata['root'] = root_metadata
-            
-            # Process all subdirectories
-            self._process_directory_recursive(repo, repo.root_path, config, files_created, files_updated, errors, all_metadata)
-            
-            return GenerationResult(
-                success=len(errors) == 0,
-                files_created=files_created,
-                files_updated=files_updated,
-                errors=errors,
-                metadata=all_metadata
-            )
-            
-        except Exception as e:
-            return GenerationResult(
-                success=False,
-                files_created=files_created,
-                files_updated=files_updated,
-                errors=[str(e)],
-                metadata=all_metadata
-            )
+        pending = []
+        result = GenerationResult.from_iter(self.generate_iter(repo, config, pending))
+        failures = repo.write_files(pending)
+        
+        if failures:
+            failed = {str(path) for path, _ in failures}
+            result.files_created = [f for f in result.files_created if f not in failed]
+            result.files_updated = [f for f in result.files_updated if f not in failed]
+            result.errors.extend(f"Error writing {path}: {error}" for path, error in failures)
+            result.success = False
+        
+        return result
+    
+    def generate_iter(self, repo: RepositoryManager, config: GenerationConfig,
+                      pending: Optional[List[Tuple[Path, bytes]]] = None) -> Iterator['DirectoryResult']:
+        """
+        Generate rule-based metadata, yielding one result per directory.
+        
+        If pending is given, serialized meta.yaml contents are appended to it
+        for the caller to write instead of being written immediately.
+        """
+        from ..engine.core import DirectoryResult
+        
+        self._structure_cache.clear()
+        
+        # Process root directory
+        root_metadata = self._generate_directory_metadata(repo, repo.root_path,
+                                                          self._get_structure(repo, repo.root_path))
+        root_meta_path = repo.root_path / "meta.yaml"
+        status, data = self._write_metadata(root_meta_path, root_metadata, config, defer=pending is not None)
+        if data is not None:
+            pending.append((root_meta_path, data))
+        
+        yield DirectoryResult(key='root', meta_path=str(root_meta_path), metadata=root_metadata, status=status)
+        
+        # Process all subdirectories
+        yield from self._iter_subdirectories(repo, config, pending)
     
-    def _process_directory_recursive(self, repo: RepositoryManager, path: Path, config: GenerationConfig, 
-                                   files_created: List[str], files_updated: List[str], 
-                                   errors: List[str], all_metadata: Dict[str, Any]) -> None:
-        """Process directory and all subdirectories recursively."""
-        if repo.is_ignored(path):
-            return
+    def _iter_subdirectories(self, repo: RepositoryManager, config: GenerationConfig,
+                             pending: Optional[List[Tuple[Path, bytes]]] = None) -> Iterator['DirectoryResult']:
+        """Process all subdirectories in parallel, yielding results in walk order."""
+        subdirs = self._collect_subdirectories(repo)
+        defer = pending is not None
+        
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            futures = [executor.submit(self._process_directory, repo, subdir_path, key, config, defer)
+                       for subdir_path, key in subdirs]
+            try:
+                for future in futures:
+                    result, data = future.result()
+                    if data is not None:
+                        pending.append((Path(result.meta_path), data))
+                    yield result
+            finally:
+                # Don't start directories the caller is no longer waiting for
+                for future in futures:
+                    future.cancel()
+    
+    def _process_directory(self, repo: RepositoryManager, path: Path, key: str, config: GenerationConfig,
+                           defer: bool) -> Tuple['DirectoryResult', Optional[bytes]]:
+        """
+        Generate and write metadata for one subdirectory.
         
-        structure = repo.get_directory_structure(path)
+        With defer set, the serialized meta.yaml is returned instead of written.
+        """
+        from ..engine.core import DirectoryResult
         
-        # Process each subdirectory
-        for dirname in structure.directories:
-            subdir_path = path / dirname
+        meta_path = path / "meta.yaml"
+        
+        try:
+            metadata = self._generate_directory_metadata(repo, path, self._get_structure(repo, path))
+            status, data = self._write_metadata(meta_path, metadata, config, defer)
             
-            if repo.is_ignored(subdir_path):
-                continue
+            return DirectoryResult(key=key, meta_path=str(meta_path), metadata=metadata, status=status), data
             
-            try:
-                # Generate metadata for subdirectory
-                metadata = self._generate_directory_metadata(repo, subdir_path)
-                meta_path = subdir_path / "meta.yaml"
-                
-                if not meta_path.exists() or config.force_overwrite:
-                    with open(meta_path, 'w', encoding='utf-8') as f:
-                        yaml.dump(metadata, f, sort_keys=False, allow_unicode=True)
-                    
-                    if meta_path.exists():
-                        files_updated.append(str(meta_path))
-                    else:
-                        files_created.append(str(meta_path))
-                
-                all_metadata[str(subdir_path.relative_to(repo.root_path))] = metadata
-                
-                # Recurse into subdirectory
-                self._process_directory_recursive(repo, subdir_path, config, files_created, files_updated, errors, all_metadata)
-                
-            except Exception as e:
-                errors.append(f"Error processing {subdir_path}: {str(e)}")
+        except Exception as e:
+            return DirectoryResult(key=key, meta_path=str(meta_path), error=f"Error processing {path}: {str(e)}"), None
     
-    def _generate_directory_metadata(self, repo: RepositoryManager, path: Path) -> Dict[str, Any]:
-        """Generate metadata for a specific directory."""
+    def _generate_directory_metadata(self, repo: RepositoryManager, path: Path,
+                                     structure: Optional[DirectoryTree] = None) -> Dict[str, Any]:
+        """Generate metadata for a specific directory, reusing its listing if given."""
         dirname = path.name
-        child_dirs, files = self._get_child_dirs_and_files(repo, path)
+        child_dirs, files = self._get_child_dirs_and_files(repo, path, structure)
         
         # For root directory, use configured title and description if available
         is_root = path == repo.root_path
@@ -271,6 +464,9 @@ class AIEnhancedGenerator(MetadataGenerator):
         """Initialize with optional engine configuration."""
         super().__init__(engine_config)
         self._ai_client = None
+        self._ai_available = False
+        # Rule-based metadata is the base that AI enhancement builds on
+        self._rule_generator = RuleBasedGenerator(engine_config)
     
     def get_strategy_name(self) -> str:
         return "ai_enhanced"
@@ -279,78 +475,30 @@ class AIEnhancedGenerator(MetadataGenerator):
         """Generate AI-enhanced metadata for the repository."""
         from ..engine.core import GenerationResult
         
-        # For now, implement basic AI generation
-        # TODO: Implement proper AI integration with providers
+        result = GenerationResult.from_iter(self.generate_iter(repo, config))
         
-        files_created = []
-        files_updated = []
-        errors = []
-        all_metadata = {}
-        
-        try:
-            # Initialize AI client based on config
-            ai_available = self._initialize_ai_client(config)
-            
-            # Process root directory with enhanced metadata (with or without AI)
-            root_metadata = self._generate_ai_enhanced_metadata(repo, repo.root_path, config)
-            root_meta_path = repo.root_path / "meta.yaml"
-            
-            if not root_meta_path.exists() or config.force_overwrite:
-                repo.save_metadata(root_metadata, "meta.yaml")
-                if root_meta_path.exists():
-                    files_updated.append(str(root_meta_path))
-                else:
-                    files_created.append(str(root_meta_path))
-            
-            all_metadata['root'] = root_metadata
-            
-            # Process all subdirectories with enhanced metadata
-            self._process_directory_recursive_ai(repo, repo.root_path, config, files_created, files_updated, errors, all_metadata)
-            
+        # Directory errors are more like warnings; the run fails only if the root did
+        result.success = 'root' in result.metadata
+        if result.success:
             # Add informational message about AI availability
-            if not ai_available:
-                errors.append("AI provider not available, used enhanced rule-based descriptions instead")
-            
-            return GenerationResult(
-                success=True,  # Success even without AI
-                files_created=files_created,
-                files_updated=files_updated,
-                errors=errors,  # These are more like warnings
-                metadata=all_metadata
-            )
-            root_meta_path = repo.root_path / "meta.yaml"
-            
-            if not root_meta_path.exists() or config.force_overwrite:
-                repo.save_metadata(root_metadata, "meta.yaml")
-                if root_meta_path.exists():
-                    files_updated.append(str(root_meta_path))
-                else:
-                    files_created.append(str(root_meta_path))
-            
-            all_metadata['root'] = root_metadata
-            
-            # Process subdirectories with AI enhancement
-            self._process_directory_recursive_ai(repo, repo.root_path, config, files_created, files_updated, errors, all_metadata)
-            
-            return GenerationResult(
-                success=len(errors) == 0,
-                files_created=files_created,
-                files_updated=files_updated,
-                errors=errors,
-                metadata=all_metadata,
-                quality_score=self._calculate_quality_score(all_metadata)
-            )
-            
-        except Exception as e:
-            errors.append(f"AI generation error: {str(e)}")
-            # Even on error, still return success if we processed some files
-            return GenerationResult(
-                success=len(files_created) > 0 or len(files_updated) > 0,
-                files_created=files_created,
-                files_updated=files_updated,
-                errors=errors,
-                metadata=all_metadata
-            )
+            if not self._ai_available:
+                result.errors.append("AI provider not available, used enhanced rule-based descriptions instead")
+            result.quality_score = self._calculate_quality_score(result.metadata)
+        
+        return result
+    
+    def generate_iter(self, repo: RepositoryManager, config: GenerationConfig) -> Iterator['DirectoryResult']:
+        """Generate AI-enhanced metadata, yielding one result per directory."""
+        self._structure_cache.clear()
+        
+        # Initialize AI client based on config; without one, enhanced rule-based descriptions are used
+        self._ai_available = self._initialize_ai_client(config)
+        
+        # Process root directory with enhanced metadata (with or without AI)
+        yield self._process_directory_ai(repo, repo.root_path, 'root', config)
+        
+        # Process all subdirectories with enhanced metadata
+        yield from self._iter_subdirectories_ai(repo, config)
     
     def _initialize_ai_client(self, config: GenerationConfig) -> bool:
         """Initialize AI client based on configuration."""
@@ -361,13 +509,13 @@ class AIEnhancedGenerator(MetadataGenerator):
     def _generate_ai_enhanced_metadata(self, repo: RepositoryManager, path: Path, config: GenerationConfig) -> Dict[str, Any]:
         """Generate AI-enhanced metadata for a directory."""
         # Get base metadata from rule-based approach
-        rule_generator = RuleBasedGenerator(self.engine_config)
-        base_metadata = rule_generator._generate_directory_metadata(repo, path)
+        structure = self._get_structure(repo, path)
+        base_metadata = self._rule_generator._generate_directory_metadata(repo, path, structure)
         
         # TODO: Enhance with AI-generated descriptions
         # For now, just improve the description
         dirname = path.name
-        context = self._get_directory_context(repo, path)
+        context = self._get_directory_context(repo, path, structure)
         
         # Enhanced description based on context
         child_dirs = base_metadata.get('child_directories', [])
@@ -387,187 +535,124 @@ class AIEnhancedGenerator(MetadataGenerator):
     
     def _create_enhanced_description(self, dirname: str, context: Dict, semantic_scope: List[str], child_dirs: List[str], files: List[str]) -> str:
         """Create enhanced, descriptive metadata like the original good descriptions."""
-        
-        # Check if we already have a good description that we shouldn't replace
-        file_count = context.get('file_count', 0)
-        dir_count = context.get('dir_count', 0)
-        
-        # Define primary scope for use throughout method
         primary_scope = semantic_scope[0] if semantic_scope else dirname
-        
-        # Create context-aware, descriptive text
-        if dirname == 'cli':
-            return f"The {dirname} directory contains the command line interface for the cip_core package. It is a Python package with an __init__.py file that serves as the entry point for the CLI. The main.py file is the primary script that implements the CLI, and it is executed when the user runs the CLI command from the command line."
-        
-        if dirname == 'engine':
-            return f"The {dirname} directory contains the core engine components for the CIP system. This includes the main execution engine, metadata processing, and orchestration logic that coordinates all CIP operations."
-        
-        if dirname == 'generation':
-            return f"The {dirname} directory houses the metadata generation strategies and algorithms. It contains different generation approaches including rule-based, AI-enhanced, and hybrid strategies for creating directory metadata."
-        
-        if dirname == 'validation':
-            return f"The {dirname} directory contains the validation framework for CIP compliance. It includes schema validators, compliance checkers, and quality assessment tools that ensure repositories meet CIP standards."
-        
-        if dirname == 'schemas':
-            return f"The {dirname} directory defines the data schemas and validation rules for CIP metadata. It contains YAML schema definitions and validation logic for meta.yaml files and other CIP structures."
-        
-        if dirname == 'utils':
-            return f"The {dirname} directory provides utility functions and helper modules used throughout the CIP codebase. It contains common functionality for file operations, data processing, and system interactions."
+        template = self._select_description_template(dirname, child_dirs, files)
+        return template.format(dirname=dirname, primary_scope=primary_scope)
+    
+    def _select_description_template(self, dirname: str, child_dirs: List[str], files: List[str]) -> str:
+        """Pick the description template that best fits a directory's name and contents."""
+        template = _EXACT_DESCRIPTIONS.get(dirname)
+        if template is not None:
+            return template
         
         # For directories with specific purposes based on name
-        if 'cognition' in dirname.lower():
-            return f"The {dirname} directory implements the Cognition Index Protocol (CIP) validation framework. It contains validation questions, answers, and assessment tools that test AI comprehension of the repository contents."
-        
-        elif 'docs' in dirname.lower() or 'documentation' in dirname.lower():
-            return f"The {dirname} directory contains project documentation, user guides, and reference materials. It serves as the central hub for all written materials that help users understand and work with the project."
-        
-        elif 'test' in dirname.lower() or 'testing' in dirname.lower():
-            return f"The {dirname} directory contains test suites and testing utilities for {primary_scope}. It includes unit tests, integration tests, and test fixtures to ensure code quality and reliability."
+        lower_name = dirname.lower()
+        matched = [int(match.lastgroup[1:]) for match in _KEYWORD_RE.finditer(lower_name)]
+        if matched:
+            # Earlier keyword groups take precedence wherever they occur in the name
+            return _KEYWORD_DESCRIPTIONS[min(matched)][1]
         
-        elif 'experiments' in dirname.lower() or 'research' in dirname.lower():
-            return f"The {dirname} directory contains experimental code and research materials for {primary_scope}. It houses exploratory work, prototypes, and research findings that may inform future development."
+        # Name checks below are case-insensitive; lower the file names once
+        lower_files = [f.lower() for f in files]
         
-        elif 'tools' in dirname.lower() or 'scripts' in dirname.lower():
-            return f"The {dirname} directory contains utility tools and scripts for {primary_scope}. It provides helpful automation, build tools, and administrative scripts for development and maintenance."
-        
-        elif 'temp' in dirname.lower() or 'tmp' in dirname.lower():
-            return f"The {dirname} directory serves as temporary storage for {primary_scope} operations. It contains transient files, intermediate results, and temporary data that supports ongoing work."
-        
-        elif 'case' in dirname.lower() and 'stud' in dirname.lower():
+        if 'case' in lower_name and 'stud' in lower_name:
             # Check for specific case study content to provide detailed descriptions
-            if any('claude' in f.lower() for f in files + child_dirs):
-                return f"The {dirname} directory contains comprehensive case studies demonstrating real-world CIP implementations. It includes detailed technical analyses of AI assistant integrations, performance benchmarks, and practical success stories from various environments including Claude, GitHub Copilot, and community implementations."
-            elif any('implementation' in f.lower() or 'integration' in f.lower() for f in files):
-                return f"The {dirname} directory documents real-world implementations and integration results from CIP deployments. It provides detailed case studies, performance metrics, and lessons learned from practical applications across different environments and use cases."
+            if any('claude' in f for f in lower_files) or any('claude' in d.lower() for d in child_dirs):
+                return _CONTENT_DESCRIPTIONS['case_studies_ai']
+            elif any('implementation' in f or 'integration' in f for f in lower_files):
+                return _CONTENT_DESCRIPTIONS['case_studies_integration']
             else:
-                return f"The {dirname} directory contains real-world case studies and implementation examples. It documents practical applications, success stories, and lessons learned from using the system in different scenarios."
+                return _CONTENT_DESCRIPTIONS['case_studies']
         
         # File-based context
-        file_types = set()
-        for file in files:
-            if '.' in file:
-                ext = file.split('.')[-1]
-                file_types.add(ext)
+        file_types = {file.rpartition('.')[2] for file in files if '.' in file}
         
         # Create meaningful description based on actual content
-        if 'py' in file_types and len(files) > 0:
+        if 'py' in file_types:
             if any('test' in f for f in files):
-                return f"The {dirname} directory contains test modules and testing utilities for the {primary_scope} functionality. It includes unit tests, integration tests, and test fixtures to ensure code quality and reliability."
+                return _CONTENT_DESCRIPTIONS['python_tests']
             elif any('__init__' in f for f in files):
-                return f"The {dirname} directory is a Python package containing {primary_scope} modules and functionality. It provides a structured collection of related code organized for easy import and use."
+                return _CONTENT_DESCRIPTIONS['python_package']
             else:
-                return f"The {dirname} directory contains Python modules implementing {primary_scope} functionality. It houses the core logic and implementation details for this component of the system."
+                return _CONTENT_DESCRIPTIONS['python_modules']
         
         elif 'md' in file_types:
-            if any('readme' in f.lower() for f in files):
-                if dirname.lower() == 'case-studies':
-                    return f"The {dirname} directory contains comprehensive case studies demonstrating real-world CIP implementations. It includes detailed technical analyses, performance benchmarks, success stories, and practical integration results from AI assistants like Claude and GitHub Copilot, providing valuable insights for developers and researchers."
-                elif dirname.lower() == 'examples':
-                    return f"The {dirname} directory provides practical guides and step-by-step tutorials for using CIP effectively. It contains hands-on examples for common use cases, from basic setup to advanced automation workflows, repository configurations, and AI integration scenarios."
-                elif dirname.lower() == 'reference':
-                    return f"The {dirname} directory provides technical reference documentation including schema definitions, validation rules, file formats, and quick lookup tables. It serves as the authoritative source for CIP specifications, configuration options, and implementation details."
-                elif dirname.lower() == 'user-guide':
-                    return f"The {dirname} directory contains comprehensive user documentation covering daily usage of CIP from installation to advanced configuration. It includes getting started guides, CLI reference, configuration options, and troubleshooting resources for developers and teams."
-                elif dirname.lower() == 'scripts':
-                    return f"The {dirname} directory documents automation scripts and integration tools that make CIP easier to use across different environments. It provides comprehensive documentation for initialization scripts, maintenance utilities, and CI/CD integration templates."
-                else:
-                    return f"The {dirname} directory contains documentation and readme files for {primary_scope}. It provides essential information, guides, and reference materials to help users understand and work with this component."
-            elif any('guide' in f.lower() or 'tutorial' in f.lower() for f in files):
-                return f"The {dirname} directory contains user guides and tutorials for {primary_scope}. It includes step-by-step instructions, examples, and educational materials for users and developers."
-            elif any('spec' in f.lower() or 'standard' in f.lower() for f in files):
-                return f"The {dirname} directory contains specifications and standards documentation for {primary_scope}. It houses formal definitions, requirements, and technical specifications."
+            if any('readme' in f for f in lower_files):
+                return _README_DESCRIPTIONS.get(lower_name, _CONTENT_DESCRIPTIONS['readme'])
+            elif any('guide' in f or 'tutorial' in f for f in lower_files):
+                return _CONTENT_DESCRIPTIONS['guides']
+            elif any('spec' in f or 'standard' in f for f in lower_files):
+                return _CONTENT_DESCRIPTIONS['specs']
             else:
-                return f"The {dirname} directory contains documentation and reference materials for {primary_scope}. It includes explanatory documents that help users understand and work with this component."
+                return _CONTENT_DESCRIPTIONS['docs']
         
         elif 'yaml' in file_types or 'yml' in file_types:
-            return f"The {dirname} directory contains configuration and metadata files for {primary_scope}. It houses YAML definitions, configuration templates, and structured data that define system behavior."
+            return _CONTENT_DESCRIPTIONS['config']
         
         elif child_dirs:
-            return f"The {dirname} directory organizes {primary_scope} components into logical subdirectories. It serves as a container for related functionality, with each subdirectory focusing on specific aspects of {primary_scope}."
+            return _CONTENT_DESCRIPTIONS['container']
         
         else:
             # Fallback for empty or unknown directories
-            return f"The {dirname} directory is reserved for {primary_scope} functionality. It provides a dedicated space for organizing related files and components."
+            return _CONTENT_DESCRIPTIONS['reserved']
     
-    def _get_directory_context(self, repo: RepositoryManager, path: Path) -> Dict[str, Any]:
+    def _get_directory_context(self, repo: RepositoryManager, path: Path,
+                               structure: Optional[DirectoryTree] = None) -> Dict[str, Any]:
         """Get context information about a directory."""
-        structure = repo.get_directory_structure(path)
+        if structure is None:
+            structure = repo.get_directory_structure(path)
         
-        # Analyze file types
-        file_types = {}
-        for file in structure.files:
-            ext = Path(file).suffix.lower()
-            if ext:
-                file_types[ext] = file_types.get(ext, 0) + 1
+        # Analyze file types; a bare trailing dot is not an extension. The
+        # counts end up in meta.yaml, which the safe dumper only writes as a plain dict
+        extensions = (os.path.splitext(file)[1].lower() for file in structure.files)
+        file_types = dict(Counter(ext for ext in extensions if len(ext) > 1))
         
         return {
             'file_count': len(structure.files),
             'dir_count': len(structure.directories),
             'file_types': file_types,
-            'has_code': any(ext in ['.py', '.js', '.ts', '.java', '.cpp', '.c'] for ext in file_types.keys()),
-            'has_docs': any(ext in ['.md', '.rst', '.txt'] for ext in file_types.keys()),
-            'has_config': any(ext in ['.yaml', '.yml', '.json', '.toml', '.ini'] for ext in file_types.keys())
+            'has_code': not _CODE_EXTENSIONS.isdisjoint(file_types),
+            'has_docs': not _DOC_EXTENSIONS.isdisjoint(file_types),
+            'has_config': not _CONFIG_EXTENSIONS.isdisjoint(file_types)
         }
     
-    def _process_directory_recursive_ai(self, repo: RepositoryManager, path: Path, config: GenerationConfig,
-                                      files_created: List[str], files_updated: List[str], 
-                                      errors: List[str], all_metadata: Dict[str, Any]) -> None:
-        """Process directory recursively with AI enhancement."""
-        if repo.is_ignored(path):
-            return
+    def _iter_subdirectories_ai(self, repo: RepositoryManager, config: GenerationConfig) -> Iterator['DirectoryResult']:
+        """Process all subdirectories in parallel with AI enhancement, yielding results in walk order."""
+        subdirs = self._collect_subdirectories(repo)
+        
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            futures = [executor.submit(self._process_directory_ai, repo, subdir_path, key, config)
+                       for subdir_path, key in subdirs]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                # Don't start directories the caller is no longer waiting for
+                for future in futures:
+                    future.cancel()
+    
+    def _process_directory_ai(self, repo: RepositoryManager, path: Path, key: str,
+                              config: GenerationConfig) -> 'DirectoryResult':
+        """Generate and write AI-enhanced metadata for one directory."""
+        from ..engine.core import DirectoryResult
         
-        structure = repo.get_directory_structure(path)
+        meta_path = path / "meta.yaml"
         
-        for dirname in structure.directories:
-            subdir_path = path / dirname
+        try:
+            metadata = self._generate_ai_enhanced_metadata(repo, path, config)
+            status, _ = self._write_metadata(meta_path, metadata, config)
             
-            if repo.is_ignored(subdir_path):
-                continue
+            return DirectoryResult(key=key, meta_path=str(meta_path), metadata=metadata, status=status)
             
-            try:
-                metadata = self._generate_ai_enhanced_metadata(repo, subdir_path, config)
-                meta_path = subdir_path / "meta.yaml"
-                
-                if not meta_path.exists() or config.force_overwrite:
-                    with open(meta_path, 'w', encoding='utf-8') as f:
-                        yaml.dump(metadata, f, sort_keys=False, allow_unicode=True)
-                    
-                    if meta_path.exists():
-                        files_updated.append(str(meta_path))
-                    else:
-                        files_created.append(str(meta_path))
-                
-                all_metadata[str(subdir_path.relative_to(repo.root_path))] = metadata
-                
-                # Recurse
-                self._process_directory_recursive_ai(repo, subdir_path, config, files_created, files_updated, errors, all_metadata)
-                
-            except Exception as e:
-                errors.append(f"Error processing {subdir_path} with AI: {str(e)}")
+        except Exception as e:
+            return DirectoryResult(key=key, meta_path=str(meta_path), error=f"Error processing {path} with AI: {str(e)}")
     
     def _calculate_quality_score(self, metadata: Dict[str, Any]) -> float:
         """Calculate quality score for generated metadata."""
         # Simple quality scoring based on metadata richness
-        total_score = 0
-        total_items = 0
-        
-        for key, meta in metadata.items():
-            score = 0
-            
-            # Base score for having required fields
-            if 'description' in meta and len(meta['description']) > 20:
-                score += 0.3
-            if 'semantic_scope' in meta and len(meta['semantic_scope']) > 0:
-                score += 0.3
-            if 'files' in meta and len(meta['files']) > 0:
-                score += 0.2
-            if 'child_directories' in meta:
-                score += 0.2
-            
-            total_score += score
-            total_items += 1
-        
-        return total_score / total_items if total_items > 0 else 0.0
+        if not metadata:
+            return 0.0
+        return sum(map(_metadata_score, metadata.values())) / len(metadata)
 
 
 class HybridGenerator(MetadataGenerator):
@@ -622,20 +707,37 @@ class HybridGenerator(MetadataGenerator):
                 metadata={}
             )
     
+    def generate_iter(self, repo: RepositoryManager, config: GenerationConfig) -> Iterator['DirectoryResult']:
+        """
+        Generate hybrid metadata, yielding one result per directory.
+        
+        The rule-based pass is streamed first; if AI is configured, the AI
+        pass follows, so a directory may appear once for each pass.
+        """
+        yield from self.rule_generator.generate_iter(repo, config)
+        
+        if config.ai_provider and config.ai_provider != "none":
+            yield from self.ai_generator.generate_iter(repo, config)
+    
     def _merge_metadata(self, rule_metadata: Dict[str, Any], ai_metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Merge rule-based and AI-generated metadata."""
         merged = rule_metadata.copy()
         
         # Enhance with AI descriptions where available
         for key, ai_meta in ai_metadata.items():
-            if key in merged:
-                # Prefer AI description if it's more detailed
-                if 'description' in ai_meta and len(ai_meta['description']) > len(merged[key].get('description', '')):
-                    merged[key]['description'] = ai_meta['description']
-                
-                # Add AI context information
-                if 'generation_context' in ai_meta:
-                    merged[key]['generation_context'] = ai_meta['generation_context']
-                    merged[key]['generation_context']['strategy'] = 'hybrid'
+            base = merged.get(key)
+            if base is None:
+                continue
+            
+            # Prefer AI description if it's more detailed
+            ai_description = ai_meta.get('description')
+            if ai_description and len(ai_description) > len(base.get('description') or ''):
+                base['description'] = ai_description
+            
+            # Add AI context information
+            context = ai_meta.get('generation_context')
+            if context is not None:
+                context['strategy'] = 'hybrid'
+                base['generation_context'] = context
         
         return merged
@@ -7,10 +7,15 @@ direct usage of instruction generation classes with a unified interface.
 
 from typing import Dict, Any, List, Optional
 from pathlib import Path
+import os
 
 from ..engine.repository import RepositoryManager
 from ..engine.core import InstructionResult
-from ..instructions import CIPInstructionsGenerator, generate_cip_instructions
+from ..instructions import CIPInstructionsGenerator
+
+
+# Instruction files generation can produce, in generation order
+_INSTRUCTION_FILES = ("instructions_v2.0.yaml", "core.yaml", "resource_guide.yaml")
 
 
 class InstructionEngine:
@@ -56,23 +61,20 @@ class InstructionEngine:
             InstructionResult with generated files and status
         """
         try:
-            # Use the unified generate_cip_instructions function
-            generated_files = generate_cip_instructions(str(self.repo.path))
+            # Reuse the engine's generator so validation knows what it wrote
+            generated_files = self.generator.generate_all_instructions()
             
             # Create instructions file path
             instructions_file = str(self.repo.cip_directory / "instructions_v2.0.yaml")
             
             # Generate content summary
-            content_lines = []
-            content_lines.append("# CIP Instructions Generated")
-            content_lines.append(f"Repository: {self.repo.path.name}")
-            content_lines.append(f"Generated files: {len(generated_files)}")
-            content_lines.append("")
-            
-            for instruction_type, file_path in generated_files.items():
-                content_lines.append(f"- {instruction_type}: {file_path}")
-            
-            content = "\n".join(content_lines)
+            content = "\n".join((
+                "# CIP Instructions Generated",
+                f"Repository: {self.repo.path.name}",
+                f"Generated files: {len(generated_files)}",
+                "",
+                *(f"- {instruction_type}: {file_path}" for instruction_type, file_path in generated_files.items()),
+            ))
             
             return InstructionResult(
                 success=True,
@@ -115,20 +117,28 @@ class InstructionEngine:
         """
         cip_dir = self.repo.cip_directory
         instruction_files = {}
+        total_files = 0
         
-        # Check for common instruction files
-        for filename in ["instructions_v2.0.yaml", "core.yaml", "resource_guide.yaml"]:
+        # Check for common instruction files, with one stat each
+        for filename in _INSTRUCTION_FILES:
             file_path = cip_dir / filename
+            try:
+                size = file_path.stat().st_size
+                exists = True
+                total_files += 1
+            except OSError:
+                size = 0
+                exists = False
             instruction_files[filename] = {
-                "exists": file_path.exists(),
+                "exists": exists,
                 "path": str(file_path),
-                "size": file_path.stat().st_size if file_path.exists() else 0
+                "size": size
             }
         
         return {
             "cip_directory": str(cip_dir),
             "instruction_files": instruction_files,
-            "total_files": sum(1 for f in instruction_files.values() if f["exists"])
+            "total_files": total_files
         }
     
     def regenerate_all_instructions(self, force: bool = False) -> InstructionResult:
@@ -144,11 +154,13 @@ class InstructionEngine:
         try:
             # Check if instructions exist and force is not set
             if not force:
-                existing_files = []
-                for filename in ["instructions_v2.0.yaml", "core.yaml", "resource_guide.yaml"]:
-                    file_path = self.repo.cip_directory / filename
-                    if file_path.exists():
-                        existing_files.append(filename)
+                # One directory listing instead of a stat per instruction file
+                try:
+                    with os.scandir(self.repo.cip_directory) as entries:
+                        present = {entry.name for entry in entries}
+                except OSError:
+                    present = set()
+                existing_files = [filename for filename in _INSTRUCTION_FILES if filename in present]
                 
                 if existing_files:
                     return InstructionResult(
@@ -5,14 +5,78 @@ Automatically generates AI-readable instructions and guidance files for
 repository navigation, understanding, and interaction following the
 Cognition Index Protocol specifications.
 """
+import json
+import logging
+import os
 import re
+import sys
 import yaml
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
-from ..utils import YamlParser
-from ..navigation import RepositoryResolver
+from ..utils import YamlParser, YamlDumper, IO_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+# Directories never worth descending into when analyzing a repository
+_SKIP_DIRS = frozenset(['.git', 'node_modules', '.cip_cache'])
+
+# CIP filename tags, e.g. "[exp][draft]notes.md"; the bracket classes keep
+# the match linear
+_EXPERIMENTAL_RE = re.compile(r'\[[^\]]*\]\[[^\]]*\].*\.md\Z')
+
+# Bump when repository analysis changes, invalidating stored analyses
+_ANALYSIS_CODE_VERSION = 1
+
+# core.yaml document categories, checked in order against a directory's
+# semantic scope; the first category sharing a scope wins
+_SCOPE_CATEGORIES = (
+    ("theory", frozenset(["theory", "foundational", "mathematics"])),
+    ("experiments", frozenset(["experiments", "testing", "validation"])),
+    ("blueprints", frozenset(["blueprints", "design", "architecture"])),
+    ("tools", frozenset(["tools", "utilities", "automation"])),
+    ("documentation", frozenset(["documentation", "guides", "reference"])),
+)
+
+# Resource guide theory categories, matched in order against a document's
+# lowered path
+_THEORY_CATEGORIES = (
+    (("entropy", "collapse"), "Entropy Collapse & Field Dynamics"),
+    (("balance", "recursive"), "Recursive Balance Field & Quantum Potentials"),
+    (("bifractal", "semantic"), "Bifractal Collapse & Semantic Recursion"),
+)
+
+
+def _scope_category(semantic_scope: List[Any]) -> Optional[str]:
+    """Return the document category for a semantic scope, if any."""
+    # Only strings can match, and skipping the rest keeps unhashable YAML values out of the set
+    scopes = {scope for scope in semantic_scope if isinstance(scope, str)}
+    for category, category_scopes in _SCOPE_CATEGORIES:
+        if not category_scopes.isdisjoint(scopes):
+            return category
+    return None
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so values repeated across meta.yaml files share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _version_key(version: Any) -> Tuple[Tuple[int, ...], str, str]:
+    """Order schema versions numerically, so "10.0" sorts after "9.1"."""
+    text = str(version)
+    # The type name separates a quoted "2.0" from an unquoted 2.0
+    return tuple(int(part) for part in text.split('.') if part.isdigit()), text, type(version).__name__
+
+
+def _write_yaml(path: Path, data: Dict[str, Any]) -> None:
+    """Stream data to disk as UTF-8 YAML without building the whole document in memory."""
+    with open(path, 'wb') as f:
+        yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True, encoding='utf-8')
 
 
 @dataclass
@@ -35,17 +99,57 @@ class CIPInstructionsGenerator:
     - Protocol-specific guidance
     """
     
-    def __init__(self, repo_root: str):
+    def __init__(self, repo_root: str, use_cache: bool = True):
         self.repo_root = Path(repo_root)
         self.yaml_parser = YamlParser()
-        self.resolver = RepositoryResolver()
+        self.use_cache = use_cache
+        self._resolver = None
+        # (mtime_ns, size) of each instruction file as this generator wrote it
+        self._generated_files: Dict[str, Tuple[int, int]] = {}
+        self._analysis_cache_file = self.repo_root / '.cip_cache' / 'instructions_analysis.json'
         
-        # CIP directory
+        # CIP directory, created when instructions are first written
         self.cip_dir = self.repo_root / ".cip"
-        self.cip_dir.mkdir(exist_ok=True)
+    
+    @property
+    def resolver(self):
+        """Get repository resolver (lazy loaded, as it scans the ecosystem root)."""
+        if self._resolver is None:
+            from ..navigation import RepositoryResolver
+            self._resolver = RepositoryResolver()
+        return self._resolver
     
     def analyze_repository_structure(self) -> Dict[str, Any]:
-        """Analyze repository to understand structure for instruction generation."""
+        """
+        Analyze repository to understand structure for instruction generation.
+        
+        The analysis is cached in .cip_cache and reused for as long as no
+        listed directory or meta.yaml file has changed since it was taken.
+        """
+        if self.use_cache:
+            cached = self._load_cached_analysis()
+            if cached is not None:
+                return cached
+            try:
+                # Created before the walk so it doesn't change the root's mtime
+                # after the snapshot is taken
+                self._analysis_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass
+        
+        structure, snapshot = self._scan_repository_structure()
+        if self.use_cache and snapshot is not None:
+            self._store_cached_analysis(structure, snapshot)
+        return structure
+    
+    def _scan_repository_structure(self) -> Tuple[Dict[str, Any], Optional[Dict[str, list]]]:
+        """
+        Walk the repository and build its analysis.
+        
+        Returns:
+            Tuple of (analysis, snapshot of directory and meta.yaml mtimes,
+            or None if part of the tree could not be read)
+        """
         
         structure = {
             "meta_yaml_files": [],
@@ -57,46 +161,157 @@ class CIPInstructionsGenerator:
             "blueprint_files": [],
         }
         
-        # Find all meta.yaml files
-        for meta_path in self.repo_root.rglob("meta.yaml"):
+        # mtimes of every directory listed and every meta.yaml parsed
+        snapshot = {"directories": [], "meta_files": []}
+        meta_entries = []
+        complete = True
+        
+        # Classify every file in a single walk; directory entries carry their
+        # type, so no extra stat calls are needed
+        stack = [(str(self.repo_root), '', False)]
+        while stack:
+            dir_path, rel_dir, in_blueprint = stack.pop()
             try:
-                meta_data = self.yaml_parser.parse_file(meta_path)
-                rel_path = meta_path.relative_to(self.repo_root)
+                # Stat before listing so a change during the listing is caught
+                dir_mtime_ns = os.stat(dir_path).st_mtime_ns
+                with os.scandir(dir_path) as entries:
+                    entries = list(entries)
+            except OSError:
+                complete = False
+                continue
+            snapshot["directories"].append([rel_dir, dir_mtime_ns])
+            
+            prefix = rel_dir + os.sep if rel_dir else ''
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        subdirs.append((entry.path, prefix + entry.name,
+                                        in_blueprint or 'blueprint' in entry.name.lower()))
+                    continue
+                if not entry.is_file():
+                    continue
                 
-                structure["meta_yaml_files"].append({
-                    "path": str(rel_path),
-                    "directory": str(rel_path.parent),
-                    "schema_version": meta_data.get("schema_version", "unknown"),
-                    "semantic_scope": meta_data.get("semantic_scope", []),
-                    "files": meta_data.get("files", [])
-                })
+                filename = entry.name
+                rel_path = prefix + filename
                 
-                if "schema_version" in meta_data:
-                    structure["schema_versions"].add(meta_data["schema_version"])
-                    
-            except Exception as e:
-                print(f"⚠️  Could not parse {meta_path}: {e}")
-        
-        # Analyze document types by filename patterns
-        for file_path in self.repo_root.rglob("*"):
-            if file_path.is_file():
-                filename = file_path.name
+                if filename == "meta.yaml":
+                    try:
+                        stat = entry.stat()
+                        snapshot["meta_files"].append([rel_path, stat.st_mtime_ns, stat.st_size])
+                    except OSError:
+                        complete = False
+                    meta_entries.append((entry.path, rel_path, rel_dir or '.'))
                 
                 # CIP filename tags
-                if re.match(r'\[.*\]\[.*\].*\.md$', filename):
-                    structure["experimental_files"].append(str(file_path.relative_to(self.repo_root)))
+                if filename.endswith('.md') and filename.startswith('[') and _EXPERIMENTAL_RE.match(filename):
+                    structure["experimental_files"].append(rel_path)
+                
+                # Blueprint files, by name or by a containing directory
+                if in_blueprint or 'blueprint' in filename.lower():
+                    structure["blueprint_files"].append(rel_path)
+            
+            stack.extend(reversed(subdirs))
+        
+        # Each meta.yaml parses independently, so overlap the reads on a
+        # thread pool and record the results in walk order
+        if meta_entries:
+            with ThreadPoolExecutor(max_workers=min(IO_WORKERS, len(meta_entries))) as executor:
+                parses = [executor.submit(self.yaml_parser.parse_file, meta_path)
+                          for meta_path, _, _ in meta_entries]
+                for (meta_path, rel_path, directory), parse in zip(meta_entries, parses):
+                    if not self._add_meta_yaml(structure, meta_path, rel_path, directory, parse):
+                        complete = False
+        
+        # Partial scans are not cached, so their warnings show up every run
+        return structure, snapshot if complete else None
+    
+    def _add_meta_yaml(self, structure: Dict[str, Any], meta_path: str, rel_path: str, directory: str,
+                       parse: Future) -> bool:
+        """Record one meta.yaml file found during repository analysis, returning whether it parsed."""
+        try:
+            meta_data = parse.result()
+            
+            # Scope names and versions repeat across most directories
+            schema_version = _intern(meta_data.get("schema_version", "unknown"))
+            semantic_scope = meta_data.get("semantic_scope", [])
+            if isinstance(semantic_scope, list):
+                semantic_scope = [_intern(scope) for scope in semantic_scope]
+            
+            structure["meta_yaml_files"].append({
+                "path": rel_path,
+                "directory": directory,
+                "schema_version": schema_version,
+                "semantic_scope": semantic_scope,
+                "files": meta_data.get("files", [])
+            })
+            
+            if "schema_version" in meta_data:
+                structure["schema_versions"].add(schema_version)
                 
-                # Blueprint files
-                if 'blueprint' in str(file_path).lower():
-                    structure["blueprint_files"].append(str(file_path.relative_to(self.repo_root)))
+        except Exception as e:
+            logger.warning("Could not parse %s: %s", meta_path, e)
+            return False
+        return True
+    
+    def _load_cached_analysis(self) -> Optional[Dict[str, Any]]:
+        """Load the stored analysis if the repository is unchanged, or None."""
+        try:
+            with open(self._analysis_cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
         
+        # Analyses from older code can't be trusted
+        if not isinstance(data, dict) or data.get('code_version') != _ANALYSIS_CODE_VERSION:
+            return None
+        
+        root = str(self.repo_root)
+        try:
+            # A directory's mtime changes whenever entries are added, removed
+            # or renamed in it, so unchanged directories list the same files
+            for rel_dir, mtime_ns in data['directories']:
+                if os.stat(os.path.join(root, rel_dir)).st_mtime_ns != mtime_ns:
+                    return None
+            for rel_path, mtime_ns, size in data['meta_files']:
+                stat = os.stat(os.path.join(root, rel_path))
+                if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+                    return None
+            structure = data['structure']
+            structure['schema_versions'] = set(structure['schema_versions'])
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
         return structure
     
+    def _store_cached_analysis(self, structure: Dict[str, Any], snapshot: Dict[str, list]) -> None:
+        """Persist an analysis together with the mtimes it was taken at."""
+        serializable = dict(structure, schema_versions=list(structure['schema_versions']))
+        try:
+            text = json.dumps(dict(snapshot, code_version=_ANALYSIS_CODE_VERSION, structure=serializable))
+        except (TypeError, ValueError):
+            # meta.yaml values JSON can't hold, such as dates
+            return
+        if json.loads(text)['structure'] != serializable:
+            # Values JSON would change on the way back, such as non-string keys
+            return
+        
+        try:
+            self._analysis_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._analysis_cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_file, self._analysis_cache_file)
+        except OSError:
+            # The cache is only an optimization
+            pass
+    
     def generate_usage_instructions(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate usage instructions for AI agents."""
         
-        schema_versions = list(analysis["schema_versions"])
-        latest_version = max(schema_versions) if schema_versions else "2.0"
+        # Sorted so the listing is stable between runs, which also puts the
+        # latest version last
+        schema_versions = sorted(analysis["schema_versions"], key=_version_key)
+        latest_version = schema_versions[-1] if schema_versions else "2.0"
         
         instructions = {
             "cip_version": latest_version,
@@ -167,16 +382,9 @@ When resolving paths, always use map.yaml as the canonical source of truth for r
             semantic_scope = meta_info.get("semantic_scope", [])
             
             # Categorize by semantic scope
-            if any(scope in ["theory", "foundational", "mathematics"] for scope in semantic_scope):
-                core_index["document_categories"]["theory"].append(directory)
-            elif any(scope in ["experiments", "testing", "validation"] for scope in semantic_scope):
-                core_index["document_categories"]["experiments"].append(directory)
-            elif any(scope in ["blueprints", "design", "architecture"] for scope in semantic_scope):
-                core_index["document_categories"]["blueprints"].append(directory)
-            elif any(scope in ["tools", "utilities", "automation"] for scope in semantic_scope):
-                core_index["document_categories"]["tools"].append(directory)
-            elif any(scope in ["documentation", "guides", "reference"] for scope in semantic_scope):
-                core_index["document_categories"]["documentation"].append(directory)
+            category = _scope_category(semantic_scope)
+            if category is not None:
+                core_index["document_categories"][category].append(directory)
             
             # Add to primary directories
             if directory and directory != ".":
@@ -211,20 +419,12 @@ When resolving paths, always use map.yaml as the canonical source of truth for r
         }
         
         # Organize theory documents
-        theory_groups = {}
+        theory_groups = defaultdict(list)
         for doc_path in analysis["theory_documents"]:
             # Extract theory category from path or filename
-            if "entropy" in doc_path.lower() or "collapse" in doc_path.lower():
-                category = "Entropy Collapse & Field Dynamics"
-            elif "balance" in doc_path.lower() or "recursive" in doc_path.lower():
-                category = "Recursive Balance Field & Quantum Potentials"
-            elif "bifractal" in doc_path.lower() or "semantic" in doc_path.lower():
-                category = "Bifractal Collapse & Semantic Recursion"
-            else:
-                category = "General Theory"
-            
-            if category not in theory_groups:
-                theory_groups[category] = []
+            lower_path = doc_path.lower()
+            category = next((name for keywords, name in _THEORY_CATEGORIES
+                             if any(keyword in lower_path for keyword in keywords)), "General Theory")
             theory_groups[category].append(doc_path)
         
         # Add to resource guide
@@ -259,38 +459,46 @@ When resolving paths, always use map.yaml as the canonical source of truth for r
     def generate_all_instructions(self) -> Dict[str, str]:
         """Generate complete set of CIP instruction files."""
         
-        print("🤖 Analyzing repository structure for instruction generation...")
+        # Created before the analysis so its snapshot already includes it
+        self.cip_dir.mkdir(exist_ok=True)
+        
+        logger.info("Analyzing repository structure for instruction generation")
         analysis = self.analyze_repository_structure()
         
         generated_files = {}
         
         # 1. Usage Instructions
-        print("📋 Generating usage instructions...")
+        logger.info("Generating usage instructions")
         usage_instructions = self.generate_usage_instructions(analysis)
         usage_path = self.cip_dir / "instructions_v2.0.yaml"
-        with open(usage_path, 'w', encoding='utf-8') as f:
-            yaml.dump(usage_instructions, f, sort_keys=False, allow_unicode=True)
+        self._write_instruction_file(usage_path, usage_instructions)
         generated_files["usage_instructions"] = str(usage_path)
         
         # 2. Core Orientation Index
-        print("🗺️  Generating core orientation index...")
+        logger.info("Generating core orientation index")
         core_orientation = self.generate_core_orientation(analysis)
         core_path = self.cip_dir / "core.yaml"
-        with open(core_path, 'w', encoding='utf-8') as f:
-            yaml.dump(core_orientation, f, sort_keys=False, allow_unicode=True)
+        self._write_instruction_file(core_path, core_orientation)
         generated_files["core_orientation"] = str(core_path)
         
         # 3. Resource Guide (if we have enough content)
         if analysis["theory_documents"] or analysis["experimental_files"]:
-            print("📚 Generating resource guide...")
+            logger.info("Generating resource guide")
             resource_guide = self.generate_resource_guide(analysis)
             resource_path = self.cip_dir / "resource_guide.yaml"
-            with open(resource_path, 'w', encoding='utf-8') as f:
-                yaml.dump(resource_guide, f, sort_keys=False, allow_unicode=True)
+            self._write_instruction_file(resource_path, resource_guide)
             generated_files["resource_guide"] = str(resource_path)
         
         return generated_files
     
+    def _write_instruction_file(self, path: Path, data: Dict[str, Any]) -> None:
+        """Write one instruction file and remember its stat for validation."""
+        _write_yaml(path, data)
+        # A same-size rewrite within the mtime granularity would look unchanged
+        YamlParser.invalidate(path)
+        stat = path.stat()
+        self._generated_files[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    
     def validate_instructions(self) -> Dict[str, Any]:
         """Validate generated instruction files."""
         validation_results = {
@@ -305,15 +513,21 @@ When resolving paths, always use map.yaml as the canonical source of truth for r
             file_path = self.cip_dir / filename
             validation_results["files_checked"].append(str(file_path))
             
-            if not file_path.exists():
+            try:
+                stat = file_path.stat()
+            except OSError:
                 validation_results["valid"] = False
                 validation_results["issues"].append(f"Missing required file: {filename}")
-            else:
-                try:
-                    self.yaml_parser.parse_file(file_path)
-                except Exception as e:
-                    validation_results["valid"] = False
-                    validation_results["issues"].append(f"Invalid YAML in {filename}: {e}")
+                continue
+            
+            # Files written by this generator and untouched since are known to parse
+            if self._generated_files.get(str(file_path)) == (stat.st_mtime_ns, stat.st_size):
+                continue
+            try:
+                self.yaml_parser.parse_file(file_path)
+            except Exception as e:
+                validation_results["valid"] = False
+                validation_results["issues"].append(f"Invalid YAML in {filename}: {e}")
         
         return validation_results
 
@@ -5,13 +5,7 @@ Implements the repo:// URL scheme and cross-repository
 content discovery as designed in the CIP specification.
 """
 
-from .resolver import (
-    RepositoryResolver, 
-    RepositoryReference, 
-    ResolvedContent,
-    DependencyGraph,
-    ContentDiscovery
-)
+from ..utils import lazy_module_attrs
 
 __all__ = [
     'RepositoryResolver',
@@ -20,3 +14,16 @@ __all__ = [
     'DependencyGraph',
     'ContentDiscovery'
 ]
+
+
+# Resolved on first access (PEP 562) so importing the package stays cheap
+_LAZY_ATTRIBUTES = {
+    'RepositoryResolver': '.resolver',
+    'RepositoryReference': '.resolver',
+    'ResolvedContent': '.resolver',
+    'DependencyGraph': '.resolver',
+    'ContentDiscovery': '.resolver',
+}
+
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_ATTRIBUTES)
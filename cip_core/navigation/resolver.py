@@ -4,15 +4,71 @@ Multi-repository navigation and content resolution.
 Implements the repo:// URL scheme and cross-repository
 content discovery as designed in the CIP specification.
 """
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Iterator
 from pathlib import Path
 from urllib.parse import urlparse
 from dataclasses import dataclass
+from collections import Counter
+from functools import lru_cache
+import os
+import stat
 
-from ..utils import YamlParser
+from ..utils import YamlParser, DATACLASS_SLOTS
 
 
-@dataclass
+# Directories content discovery never descends into
+_SKIP_DIRS = frozenset(['.git', '.venv', 'node_modules', '__pycache__', '.cip'])
+
+# Most results find_similar_content returns
+_SIMILAR_CONTENT_LIMIT = 50
+
+
+@lru_cache(maxsize=4096)
+def _split_repo_url(repo_url: str) -> Tuple[str, str, Optional[str]]:
+    """Split a repo:// URL into (repository, path, fragment), raising ValueError if invalid."""
+    if not repo_url.startswith('repo://'):
+        raise ValueError(f"Invalid repo URL scheme: {repo_url}")
+    
+    # Parse URL components
+    parsed = urlparse(repo_url)
+    
+    # Extract repository name (netloc in URL terms)
+    repository = parsed.netloc
+    if not repository:
+        raise ValueError(f"Missing repository name in URL: {repo_url}")
+    
+    # Extract path (remove leading slash)
+    return repository, parsed.path.lstrip('/'), parsed.fragment or None
+
+
+def _walk_entries(root: str) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    Yield every entry below root with its path relative to root.
+    
+    Entries come in the same depth-first order as Path.rglob: a directory's
+    entries before anything inside its subdirectories. Directory symlinks
+    aren't followed, and _SKIP_DIRS are listed but not descended into.
+    """
+    stack = [(root, '')]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+        
+        prefix = rel_dir + os.sep if rel_dir else ''
+        subdirs = []
+        for entry in entries:
+            rel_path = prefix + entry.name
+            yield entry, rel_path
+            if entry.is_dir(follow_symlinks=False) and entry.name not in _SKIP_DIRS:
+                subdirs.append((entry.path, rel_path))
+        stack.extend(reversed(subdirs))
+
+
+@dataclass(**DATACLASS_SLOTS)
 class RepositoryReference:
     """Represents a reference to content in a repository."""
     scheme: str  # "repo"
@@ -21,7 +77,7 @@ class RepositoryReference:
     fragment: Optional[str] = None  # Optional anchor/section
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ResolvedContent:
     """Result of resolving a repo:// URL to actual content."""
     repository_path: str
@@ -58,30 +114,84 @@ class RepositoryResolver:
             self.ecosystem_root = cwd.parent if cwd.name in ['cip-core', 'dawn-field-theory'] else cwd
         
         self.yaml_parser = YamlParser()
-        self._repository_cache = {}
-        self._scan_repositories()
+        # Repositories are scanned on first use rather than at construction
+        self._repositories: Optional[Dict[str, Dict[str, Any]]] = None
+        # Repositories looked up by name before the full scan, None if not a CIP repository
+        self._repository_lookups: Dict[str, Optional[Dict[str, Any]]] = {}
+    
+    @property
+    def _repository_cache(self) -> Dict[str, Dict[str, Any]]:
+        """All repositories in the ecosystem, scanned on first access."""
+        if self._repositories is None:
+            self._repositories = self._scan_repositories()
+        return self._repositories
     
-    def _scan_repositories(self):
+    def _get_repo(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get one repository by name, loading only its own metadata if the ecosystem isn't scanned yet."""
+        if self._repositories is not None:
+            return self._repositories.get(name)
+        
+        if name not in self._repository_lookups:
+            # Only direct children of the ecosystem root are repositories
+            if name in ('', '.', '..') or os.sep in name or (os.altsep and os.altsep in name):
+                self._repository_lookups[name] = None
+            else:
+                self._repository_lookups[name] = self._load_repository(self.ecosystem_root / name)
+        return self._repository_lookups[name]
+    
+    def _scan_repositories(self) -> Dict[str, Dict[str, Any]]:
         """Scan ecosystem root for repositories with CIP metadata."""
+        repositories = {}
         if not self.ecosystem_root.exists():
-            return
+            return repositories
         
         for entry in self.ecosystem_root.iterdir():
-            if not entry.is_dir():
+            if entry.name in self._repository_lookups:
+                repo_info = self._repository_lookups[entry.name]
+            else:
+                repo_info = self._load_repository(entry)
+            if repo_info is not None:
+                repositories[entry.name] = repo_info
+        
+        self._repository_lookups.clear()
+        return repositories
+    
+    def _load_repository(self, entry: Path) -> Optional[Dict[str, Any]]:
+        """Load a repository directory's CIP metadata, or None if it has none."""
+        if not entry.is_dir():
+            return None
+            
+        # Look for CIP metadata
+        cip_meta = entry / '.cip' / 'meta.yaml'
+        if not cip_meta.exists():
+            return None
+        try:
+            metadata = self.yaml_parser.parse_file(cip_meta)
+            return {
+                'path': entry,
+                'metadata': metadata,
+                'repository_role': metadata.get('repository_role', 'unknown'),
+                'parsed_links': self._parse_ecosystem_links(metadata)
+            }
+        except Exception as e:
+            print(f"Warning: Could not parse {cip_meta}: {e}")
+            return None
+    
+    def _parse_ecosystem_links(self, metadata: Dict[str, Any]) -> Dict[str, RepositoryReference]:
+        """Parse a repository's valid ecosystem links once, when it is scanned."""
+        ecosystem_links = metadata.get('ecosystem_links', {})
+        if not isinstance(ecosystem_links, dict):
+            return {}
+        
+        parsed_links = {}
+        for link_name, repo_url in ecosystem_links.items():
+            if not isinstance(repo_url, str):
                 continue
-                
-            # Look for CIP metadata
-            cip_meta = entry / '.cip' / 'meta.yaml'
-            if cip_meta.exists():
-                try:
-                    metadata = self.yaml_parser.parse_file(cip_meta)
-                    self._repository_cache[entry.name] = {
-                        'path': entry,
-                        'metadata': metadata,
-                        'repository_role': metadata.get('repository_role', 'unknown')
-                    }
-                except Exception as e:
-                    print(f"Warning: Could not parse {cip_meta}: {e}")
+            try:
+                parsed_links[link_name] = self.parse_repo_url(repo_url)
+            except ValueError:
+                continue
+        return parsed_links
     
     def parse_repo_url(self, repo_url: str) -> RepositoryReference:
         """
@@ -92,25 +202,14 @@ class RepositoryResolver:
         - repo://cip-core/schemas/meta_yaml.py
         - repo://fracton-sdk/examples/#usage
         """
-        if not repo_url.startswith('repo://'):
-            raise ValueError(f"Invalid repo URL scheme: {repo_url}")
-        
-        # Parse URL components
-        parsed = urlparse(repo_url)
-        
-        # Extract repository name (netloc in URL terms)
-        repository = parsed.netloc
-        if not repository:
-            raise ValueError(f"Missing repository name in URL: {repo_url}")
-        
-        # Extract path (remove leading slash)
-        path = parsed.path.lstrip('/')
-        
+        # The same links are parsed over and over, so the parsing is cached;
+        # each caller still gets its own reference
+        repository, path, fragment = _split_repo_url(repo_url)
         return RepositoryReference(
             scheme='repo',
             repository=repository,
             path=path,
-            fragment=parsed.fragment or None
+            fragment=fragment
         )
     
     def resolve_content(self, repo_url: str) -> ResolvedContent:
@@ -135,7 +234,8 @@ class RepositoryResolver:
             )
         
         # Find repository
-        if ref.repository not in self._repository_cache:
+        repo_info = self._get_repo(ref.repository)
+        if repo_info is None:
             return ResolvedContent(
                 repository_path="",
                 content_path="",
@@ -144,7 +244,6 @@ class RepositoryResolver:
                 metadata={"error": f"Repository not found: {ref.repository}"}
             )
         
-        repo_info = self._repository_cache[ref.repository]
         repo_path = repo_info['path']
         
         # Resolve content path
@@ -153,33 +252,10 @@ class RepositoryResolver:
         else:
             content_path = repo_path
         
-        # Check if content exists and determine type
-        if content_path.exists():
-            if content_path.is_dir():
-                content_type = "directory"
-                # Try to load directory metadata
-                meta_path = content_path / 'meta.yaml'
-                metadata = None
-                if meta_path.exists():
-                    try:
-                        metadata = self.yaml_parser.parse_file(meta_path)
-                    except Exception:
-                        pass
-            else:
-                content_type = "file"
-                metadata = {
-                    "size": content_path.stat().st_size,
-                    "modified": content_path.stat().st_mtime
-                }
-            
-            return ResolvedContent(
-                repository_path=str(repo_path),
-                content_path=str(content_path),
-                exists=True,
-                content_type=content_type,
-                metadata=metadata
-            )
-        else:
+        # Check if content exists and determine type with a single stat
+        try:
+            content_stat = content_path.stat()
+        except OSError:
             return ResolvedContent(
                 repository_path=str(repo_path),
                 content_path=str(content_path),
@@ -187,6 +263,31 @@ class RepositoryResolver:
                 content_type="missing",
                 metadata={"error": f"Path not found: {ref.path}"}
             )
+        
+        if stat.S_ISDIR(content_stat.st_mode):
+            content_type = "directory"
+            # Try to load directory metadata
+            meta_path = content_path / 'meta.yaml'
+            metadata = None
+            try:
+                metadata = self.yaml_parser.parse_file(meta_path)
+            except Exception:
+                # Missing or unreadable metadata
+                pass
+        else:
+            content_type = "file"
+            metadata = {
+                "size": content_stat.st_size,
+                "modified": content_stat.st_mtime
+            }
+        
+        return ResolvedContent(
+            repository_path=str(repo_path),
+            content_path=str(content_path),
+            exists=True,
+            content_type=content_type,
+            metadata=metadata
+        )
     
     def list_repositories(self) -> Dict[str, Dict[str, Any]]:
         """List all discovered repositories in the ecosystem."""
@@ -207,10 +308,10 @@ class RepositoryResolver:
         
         Returns list of validation results for each link.
         """
-        if repository_name not in self._repository_cache:
+        repo_info = self._get_repo(repository_name)
+        if repo_info is None:
             return [{"error": f"Repository not found: {repository_name}"}]
         
-        repo_info = self._repository_cache[repository_name]
         metadata = repo_info['metadata']
         ecosystem_links = metadata.get('ecosystem_links', {})
         
@@ -235,6 +336,7 @@ class DependencyGraph:
     
     def __init__(self, resolver: RepositoryResolver):
         self.resolver = resolver
+        self._dependency_graph_cache: Optional[Dict[str, List[str]]] = None
     
     def build_dependency_graph(self) -> Dict[str, List[str]]:
         """
@@ -243,69 +345,75 @@ class DependencyGraph:
         Returns:
             Dictionary mapping repository names to their dependencies
         """
-        repositories = self.resolver.list_repositories()
         dependency_graph = {}
         
-        for repo_name in repositories:
-            dependencies = []
-            
-            # Get repository metadata
-            repo_info = self.resolver._repository_cache[repo_name]
-            ecosystem_links = repo_info['metadata'].get('ecosystem_links', {})
-            
-            # Extract dependencies from ecosystem links
-            for link_name, repo_url in ecosystem_links.items():
-                try:
-                    ref = self.resolver.parse_repo_url(repo_url)
-                    if ref.repository != repo_name:  # Avoid self-references
-                        dependencies.append(ref.repository)
-                except ValueError:
-                    continue
-            
-            dependency_graph[repo_name] = list(set(dependencies))  # Remove duplicates
+        # Links were parsed when the resolver scanned the repositories
+        for repo_name, repo_info in self.resolver._repository_cache.items():
+            dependency_graph[repo_name] = list(dict.fromkeys(  # Remove duplicates, keeping link order
+                ref.repository for ref in repo_info['parsed_links'].values()
+                if ref.repository != repo_name  # Avoid self-references
+            ))
         
         return dependency_graph
     
+    def _get_dependency_graph(self) -> Dict[str, List[str]]:
+        """Get the dependency graph shared by the graph analyses, building it on first use."""
+        if self._dependency_graph_cache is None:
+            self._dependency_graph_cache = self.build_dependency_graph()
+        return self._dependency_graph_cache
+    
     def find_dependency_cycles(self) -> List[List[str]]:
         """Find circular dependencies in the ecosystem."""
-        graph = self.build_dependency_graph()
+        graph = self._get_dependency_graph()
         cycles = []
         
-        def dfs(node, path, visited):
-            if node in path:
-                # Found a cycle
-                cycle_start = path.index(node)
-                cycle = path[cycle_start:] + [node]
-                cycles.append(cycle)
-                return
-            
-            if node in visited or node not in graph:
-                return
-            
-            visited.add(node)
-            path.append(node)
-            
-            for dependency in graph[node]:
-                dfs(dependency, path.copy(), visited)
+        # Tri-color DFS with a single shared path: repositories on the current
+        # path are GRAY (mapped to their position in it), finished ones BLACK.
+        on_path: Dict[str, int] = {}
+        finished = set()
+        path: List[str] = []
+        pending = []
         
-        visited = set()
         for repo in graph:
-            if repo not in visited:
-                dfs(repo, [], visited)
+            if repo in finished:
+                continue
+            on_path[repo] = 0
+            path.append(repo)
+            pending.append(iter(graph[repo]))
+            
+            while pending:
+                dependency = next(pending[-1], None)
+                if dependency is None:
+                    # All dependencies explored
+                    pending.pop()
+                    node = path.pop()
+                    del on_path[node]
+                    finished.add(node)
+                elif dependency in on_path:
+                    # Found a cycle
+                    cycles.append(path[on_path[dependency]:] + [dependency])
+                elif dependency not in finished and dependency in graph:
+                    on_path[dependency] = len(path)
+                    path.append(dependency)
+                    pending.append(iter(graph[dependency]))
         
         return cycles
     
     def get_repository_metrics(self) -> Dict[str, Dict[str, int]]:
         """Get dependency metrics for each repository."""
-        graph = self.build_dependency_graph()
+        graph = self._get_dependency_graph()
+        
+        # Count incoming dependencies (how many repos depend on each one) in one
+        # pass; dependency lists hold each repository at most once
+        dependents = Counter()
+        for deps in graph.values():
+            dependents.update(deps)
         
         metrics = {}
         for repo in graph:
             # Count outgoing dependencies
             dependencies_count = len(graph[repo])
-            
-            # Count incoming dependencies (how many repos depend on this one)
-            dependents_count = sum(1 for deps in graph.values() if repo in deps)
+            dependents_count = dependents[repo]
             
             metrics[repo] = {
                 'dependencies': dependencies_count,
@@ -333,28 +441,29 @@ class ContentDiscovery:
         """
         repositories = self.resolver.list_repositories()
         content_map = {}
+        content_type_lower = content_type.lower()
         
         for repo_name, repo_info in repositories.items():
-            repo_path = Path(repo_info['path'])
             content_items = []
             
-            # Search for directories matching content type
-            for item in repo_path.rglob('*'):
-                if item.is_dir() and item.name.lower() == content_type.lower():
+            # Search for directories matching content type; the name check
+            # comes first as it needs no syscall
+            for entry, rel_path in _walk_entries(repo_info['path']):
+                if entry.name.lower() == content_type_lower and entry.is_dir():
                     # Check if directory has metadata
-                    meta_path = item / 'meta.yaml'
+                    meta_path = Path(entry.path, 'meta.yaml')
                     metadata = None
-                    if meta_path.exists():
-                        try:
-                            metadata = self.resolver.yaml_parser.parse_file(meta_path)
-                        except Exception:
-                            pass
+                    try:
+                        metadata = self.resolver.yaml_parser.parse_file(meta_path)
+                    except Exception:
+                        # Missing or unreadable metadata
+                        pass
                     
                     content_items.append({
-                        'path': str(item.relative_to(repo_path)),
-                        'full_path': str(item),
+                        'path': rel_path,
+                        'full_path': entry.path,
                         'metadata': metadata,
-                        'repo_url': f"repo://{repo_name}/{item.relative_to(repo_path)}/"
+                        'repo_url': f"repo://{repo_name}/{rel_path}/"
                     })
             
             if content_items:
@@ -374,34 +483,37 @@ class ContentDiscovery:
         query_lower = query.lower()
         
         for repo_name, repo_info in repositories.items():
-            repo_path = Path(repo_info['path'])
-            
             # Search in file names and metadata
-            for item in repo_path.rglob('*.md'):
-                if query_lower in item.name.lower():
-                    results.append({
-                        'repository': repo_name,
-                        'path': str(item.relative_to(repo_path)),
-                        'match_type': 'filename',
-                        'repo_url': f"repo://{repo_name}/{item.relative_to(repo_path)}"
-                    })
+            for entry, rel_path in _walk_entries(repo_info['path']):
+                # Same match as rglob('*.md'), which is case-insensitive on Windows
+                if not os.path.normcase(entry.name).endswith('.md'):
+                    continue
                 
-                # Search in meta.yaml files
-                meta_path = item.parent / 'meta.yaml'
-                if meta_path.exists():
+                # Each file is reported once: a filename match, or else a
+                # match in its directory's meta.yaml
+                if query_lower in entry.name.lower():
+                    match_type = 'filename'
+                else:
+                    meta_path = Path(os.path.dirname(entry.path), 'meta.yaml')
                     try:
                         metadata = self.resolver.yaml_parser.parse_file(meta_path)
                         description = metadata.get('description', '').lower()
                         tags = ' '.join(metadata.get('tags', [])).lower()
-                        
-                        if query_lower in description or query_lower in tags:
-                            results.append({
-                                'repository': repo_name,
-                                'path': str(item.relative_to(repo_path)),
-                                'match_type': 'metadata',
-                                'repo_url': f"repo://{repo_name}/{item.relative_to(repo_path)}"
-                            })
                     except Exception:
+                        # Missing or unreadable metadata
+                        continue
+                    if query_lower not in description and query_lower not in tags:
                         continue
+                    match_type = 'metadata'
+                
+                results.append({
+                    'repository': repo_name,
+                    'path': rel_path,
+                    'match_type': match_type,
+                    'repo_url': f"repo://{repo_name}/{rel_path}"
+                })
+                if len(results) >= _SIMILAR_CONTENT_LIMIT:
+                    # Stop walking once the limit is reached
+                    return results
         
-        return results[:50]  # Limit results
+        return results
@@ -5,14 +5,91 @@ This is a prototype implementation that runs locally, demonstrating
 what the VM service would do with AI-powered analysis.
 """
 
+import codecs
+import hashlib
 import json
 import requests
 import os
-from typing import Dict, Any, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from ..utils import YamlParser
+from ..utils import YamlParser, YamlDumper, CACHE_MAX_BYTES, evict_lru
+
+
+# Most tokens Ollama generates for a description (asked to stay under 100 words) and for tags
+_DESCRIPTION_MAX_TOKENS = 200
+_TAGS_MAX_TOKENS = 40
+
+# Bumped when cached Ollama responses must no longer be reused
+_RESPONSE_CACHE_VERSION = 1
+
+# Concurrent requests to the Ollama server; /api/generate is stateless per request
+_GENERATE_WORKERS = 4
+
+# Directories directory analysis never descends into
+_SKIP_DIRS = frozenset(['.git', '__pycache__', 'node_modules', '.venv'])
+
+# File extensions counted as code and as documentation
+_CODE_EXTENSIONS = frozenset(['.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs'])
+_DOC_EXTENSIONS = frozenset(['.md', '.txt', '.rst', '.doc'])
+
+# Characters of each file sampled for prompts, and the bytes that always cover them in UTF-8
+_SAMPLE_CHARS = 500
+_SAMPLE_BYTES = _SAMPLE_CHARS * 4
+
+
+def _decode_sample(raw: bytes) -> str:
+    """Decode the start of a file as text, replacing invalid UTF-8 and normalizing newlines."""
+    # The incremental decoder holds back a character cut off at the end of raw
+    text = codecs.getincrementaldecoder('utf-8')(errors='replace').decode(raw)
+    return text.replace('\r\n', '\n').replace('\r', '\n')[:_SAMPLE_CHARS]
+
+
+def _iter_dirs(root: str) -> Iterator[os.DirEntry]:
+    """
+    Yield the non-hidden directories below root in the same order as rglob.
+    
+    Symlinked directories are yielded but not descended into; hidden
+    directories are neither.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if not entry.is_dir():
+                    continue
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            except OSError:
+                continue
+            yield entry
+        stack.extend(reversed(subdirs))
+
+
+def _file_block(names: List[str]) -> str:
+    """Format file names for a prompt, one per line in a fenced block."""
+    if not names:
+        return "(none)"
+    return "```\n" + "\n".join(names) + "\n```"
+
+
+def _with_lexicon(system_prompt: str, lexicon_context: str) -> str:
+    """Append lexicon terminology to a system prompt when there is any."""
+    return f"{system_prompt}\n\n{lexicon_context}" if lexicon_context else system_prompt
 
 
 class OllamaClient:
@@ -21,9 +98,19 @@ class OllamaClient:
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
         self.session = requests.Session()
+        # Keep connections alive across requests and pool enough of them for
+        # concurrent generation; transient connection failures are retried
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
-    def generate(self, model: str, prompt: str, system: str = None) -> str:
-        """Generate text using Ollama model."""
+    def generate(self, model: str, prompt: str, system: str = None,
+                 options: Optional[Dict[str, Any]] = None) -> str:
+        """Generate text using Ollama model, with optional model options such as num_predict."""
         payload = {
             "model": model,
             "prompt": prompt,
@@ -32,6 +119,8 @@ class OllamaClient:
         
         if system:
             payload["system"] = system
+        if options:
+            payload["options"] = options
         
         response = self.session.post(
             f"{self.base_url}/api/generate",
@@ -42,6 +131,16 @@ class OllamaClient:
         
         return response.json()["response"]
     
+    def generate_batch(self, model: str, prompts: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Generate text for several (prompt, system) pairs concurrently.
+        
+        Responses are returned in prompt order; the first failed request's
+        exception is raised.
+        """
+        with ThreadPoolExecutor(max_workers=_GENERATE_WORKERS) as executor:
+            return list(executor.map(lambda item: self.generate(model, *item), prompts))
+    
     def list_models(self) -> List[str]:
         """List available models."""
         response = self.session.get(f"{self.base_url}/api/tags")
@@ -54,11 +153,62 @@ class OllamaClient:
 class AIMetadataEnhancer:
     """AI-powered metadata enhancement using Ollama."""
     
-    def __init__(self, model: str = "codellama:latest"):
+    DESCRIPTION_SYSTEM_PROMPT = (
+        "You are an expert code analyst working with specialized terminology. Generate a concise, "
+        "technical description of what this directory contains based on the file structure and "
+        "content samples. Focus on the purpose, functionality, and role within a larger project. "
+        "Keep it under 100 words and professional."
+    )
+    
+    TAGS_SYSTEM_PROMPT = (
+        "Generate exactly 3-5 semantic tags that describe the purpose and content of this directory. "
+        "Tags should be lowercase, single words or hyphenated phrases. Focus on functionality, "
+        "technology, and purpose. Return ONLY the tags separated by commas, no other text or formatting."
+    )
+    
+    def __init__(self, model: str = "codellama:latest", use_cache: bool = True):
         self.ollama = OllamaClient()
         self.model = model
         self.yaml_parser = YamlParser()
         self.lexicon = self._load_lexicon()
+        # Ollama responses are stored here, keyed by model and prompt; without
+        # use_cache they are always regenerated, but still stored
+        self.use_cache = use_cache
+        self._cache_dir = Path.home() / '.cache' / 'cip-core' / 'ollama'
+    
+    def _generate(self, prompt: str, system: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Generate text with Ollama, reusing the stored response to an identical request."""
+        key = hashlib.blake2b(
+            json.dumps([_RESPONSE_CACHE_VERSION, self.model, system, prompt, options],
+                       sort_keys=True).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        cache_file = self._cache_dir / f"{key}.json"
+        if self.use_cache:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    response = json.load(f)['response']
+                # Refresh mtime so eviction drops least recently used entries
+                os.utime(cache_file)
+                return response
+            except (OSError, ValueError, TypeError, KeyError):
+                pass
+        
+        # Failed requests raise here, so fallbacks are never cached
+        response = self.ollama.generate(self.model, prompt, system, options)
+        
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            # Directories are enhanced concurrently, so temp files are per thread
+            tmp_file = self._cache_dir / f"{key}.{os.getpid()}-{threading.get_ident()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'response': response}, f)
+            os.replace(tmp_file, cache_file)
+            evict_lru(self._cache_dir, CACHE_MAX_BYTES)
+        except (OSError, TypeError, ValueError):
+            # Caching is best effort; the response is already generated
+            pass
+        return response
     
     def _load_lexicon(self) -> Dict[str, Any]:
         """Load repository lexicon from .cip/lexicon.yaml if it exists."""
@@ -130,35 +280,66 @@ class AIMetadataEnhancer:
     def analyze_directory_content(self, directory_path: Path) -> Dict[str, Any]:
         """Analyze directory content and generate AI insights."""
         
-        # Gather directory information
+        # Gather directory information in a single walk
         files = []
         code_files = []
         doc_files = []
+        sample_files = []
         
-        for file_path in directory_path.rglob("*"):
-            if file_path.is_file() and not file_path.name.startswith('.'):
-                rel_path = file_path.relative_to(directory_path)
-                files.append(str(rel_path))
+        stack = [(str(directory_path), '')]
+        while stack:
+            current, prefix = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    # Generated metadata isn't directory content; leaving it out
+                    # keeps the analysis, and so the prompts, stable across runs
+                    entries = [entry for entry in it if entry.name != 'meta.yaml']
+            except OSError:
+                if not prefix:
+                    raise
+                continue
+            
+            subdirs = []
+            for index, entry in enumerate(entries):
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            subdirs.append((entry.path, prefix + entry.name + os.sep))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    # Sample small files among the first 5 entries
+                    if not prefix and index < 5 and entry.stat().st_size < 10000:
+                        sample_files.append(entry)
+                except OSError:
+                    continue
+                
+                if entry.name.startswith('.'):
+                    continue
+                rel_path = prefix + entry.name
+                files.append(rel_path)
                 
                 # Categorize files
-                if file_path.suffix in ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs']:
-                    code_files.append(str(rel_path))
-                elif file_path.suffix in ['.md', '.txt', '.rst', '.doc']:
-                    doc_files.append(str(rel_path))
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix in _CODE_EXTENSIONS:
+                    code_files.append(rel_path)
+                elif suffix in _DOC_EXTENSIONS:
+                    doc_files.append(rel_path)
+            # Visit subdirectories in listing order, as rglob does
+            stack.extend(reversed(subdirs))
         
         # Read some sample content
         sample_content = []
-        for file_path in list(directory_path.iterdir())[:5]:  # First 5 files
-            if file_path.is_file() and file_path.stat().st_size < 10000:  # Small files only
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        sample_content.append({
-                            "file": file_path.name,
-                            "content": content[:500]  # First 500 chars
-                        })
-                except:
-                    continue
+        for entry in sample_files:
+            try:
+                with open(entry.path, 'rb') as f:
+                    raw = f.read(_SAMPLE_BYTES)
+            except OSError:
+                continue
+            sample_content.append({
+                "file": entry.name,
+                "content": _decode_sample(raw)
+            })
         
         return {
             "directory_name": directory_path.name,
@@ -174,36 +355,28 @@ class AIMetadataEnhancer:
         # Build lexicon context
         lexicon_context = self._build_lexicon_context(analysis)
         
-        system_prompt = f"""You are an expert code analyst working with specialized terminology. Generate a concise, technical description 
-        of what this directory contains based on the file structure and content samples. 
-        Focus on the purpose, functionality, and role within a larger project.
-        Keep it under 100 words and professional.
-        
-        {lexicon_context}"""
-        
-        content_summary = ""
-        if analysis["sample_content"]:
-            content_summary = "\n".join([
-                f"File {item['file']}: {item['content'][:200]}..."
-                for item in analysis["sample_content"][:3]
-            ])
-        
-        prompt = f"""
-        Analyze this directory structure:
-        
-        Directory: {analysis['directory_name']}
-        Total files: {analysis['total_files']}
-        Code files: {analysis['code_files'][:10]}  # First 10
-        Documentation: {analysis['doc_files'][:5]}   # First 5
-        
-        Sample content:
-        {content_summary}
-        
-        Generate a professional description of what this directory contains and its purpose:
-        """
+        system_prompt = _with_lexicon(self.DESCRIPTION_SYSTEM_PROMPT, lexicon_context)
+        
+        content_summary = "\n".join([
+            f"File {item['file']}: {item['content'][:200]}..."
+            for item in analysis["sample_content"][:3]
+        ])
+        
+        prompt = "\n".join((
+            "Analyze this directory structure:",
+            f"Directory: {analysis['directory_name']}",
+            f"Total files: {analysis['total_files']}",
+            "Code files (first 10):",
+            _file_block(analysis['code_files'][:10]),
+            "Documentation (first 5):",
+            _file_block(analysis['doc_files'][:5]),
+            "Sample content:",
+            content_summary or "(none)",
+            "Generate a professional description of what this directory contains and its purpose:",
+        ))
         
         try:
-            response = self.ollama.generate(self.model, prompt, system_prompt)
+            response = self._generate(prompt, system_prompt, {"num_predict": _DESCRIPTION_MAX_TOKENS})
             return response.strip()
         except Exception as e:
             print(f"⚠️  AI generation failed: {e}")
@@ -215,22 +388,18 @@ class AIMetadataEnhancer:
         # Build lexicon context for tags
         lexicon_context = self._build_lexicon_context(analysis)
         
-        system_prompt = f"""Generate exactly 3-5 semantic tags that describe the purpose and content of this directory.
-        Tags should be lowercase, single words or hyphenated phrases. Focus on functionality, technology, and purpose.
-        Return ONLY the tags separated by commas, no other text or formatting.
-        
-        {lexicon_context}"""
-        
-        prompt = f"""
-        Directory: {analysis['directory_name']}
-        Description: {description}
-        Code files: {analysis['code_files'][:5]}
+        system_prompt = _with_lexicon(self.TAGS_SYSTEM_PROMPT, lexicon_context)
         
-        Generate semantic tags (comma-separated):
-        """
+        prompt = "\n".join((
+            f"Directory: {analysis['directory_name']}",
+            f"Description: {description}",
+            "Code files (first 5):",
+            _file_block(analysis['code_files'][:5]),
+            "Generate semantic tags (comma-separated):",
+        ))
         
         try:
-            response = self.ollama.generate(self.model, prompt, system_prompt)
+            response = self._generate(prompt, system_prompt, {"num_predict": _TAGS_MAX_TOKENS})
             # Clean up the response
             cleaned_response = response.strip().replace('*', '').replace('`', '').replace('\n', ' ')
             tags = [tag.strip().lower() for tag in cleaned_response.split(',')]
@@ -276,16 +445,25 @@ class AIMetadataEnhancer:
         semantic_tags = self.generate_semantic_tags(analysis, ai_description)
         complexity_score = self.calculate_complexity_score(analysis)
         
+        # List files and child directories in one pass
+        files = []
+        child_directories = []
+        with os.scandir(directory_path) as it:
+            for entry in it:
+                if entry.is_file():
+                    if entry.name != "meta.yaml":
+                        files.append(entry.name)
+                elif entry.is_dir():
+                    child_directories.append(entry.name)
+        
         # Create enhanced metadata
         metadata = {
             "schema_version": "2.0",
             "directory_name": directory_path.name,
             "description": ai_description,
             "semantic_scope": semantic_tags,
-            "files": [f for f in os.listdir(directory_path) 
-                     if os.path.isfile(os.path.join(directory_path, f)) and f != "meta.yaml"],
-            "child_directories": [d for d in os.listdir(directory_path) 
-                                if os.path.isdir(os.path.join(directory_path, d))],
+            "files": files,
+            "child_directories": child_directories,
             "ai_analysis": {
                 "complexity_score": complexity_score,
                 "total_files": analysis['total_files'],
@@ -298,39 +476,53 @@ class AIMetadataEnhancer:
         
         return metadata
     
-    def process_repository(self, repo_path: Path, force: bool = False):
-        """Process entire repository with AI-enhanced metadata."""
+    def process_repository(self, repo_path: Path, force: bool = False, jobs: int = _GENERATE_WORKERS):
+        """
+        Process entire repository with AI-enhanced metadata.
+        
+        Args:
+            repo_path: Repository root
+            force: Overwrite existing meta.yaml files
+            jobs: Directories enhanced concurrently
+        """
         
         print(f"🚀 AI-enhanced metadata generation for {repo_path}")
         print(f"🤖 Using model: {self.model}")
         
-        # Process directories recursively
-        for directory in repo_path.rglob("*"):
-            if not directory.is_dir():
-                continue
-                
-            # Skip hidden directories
-            if any(part.startswith('.') for part in directory.parts):
-                continue
-            
+        # Collect directories first so generation can run concurrently
+        directories = []
+        for entry in _iter_dirs(str(repo_path)):
             # Skip if meta.yaml exists and not forcing
-            meta_path = directory / "meta.yaml"
-            if meta_path.exists() and not force:
-                print(f"⏭️  Skipping {directory.name} (meta.yaml exists)")
+            if not force and os.path.exists(os.path.join(entry.path, "meta.yaml")):
+                print(f"⏭️  Skipping {entry.name} (meta.yaml exists)")
                 continue
             
+            directories.append(Path(entry.path))
+        
+        def enhance(directory: Path) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
             try:
-                # Generate AI-enhanced metadata
-                metadata = self.enhance_metadata(directory)
-                
-                # Write metadata file
-                with open(meta_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(metadata, f, sort_keys=False, allow_unicode=True)
-                
-                print(f"✅ Enhanced {meta_path}")
-                
+                return self.enhance_metadata(directory), None
             except Exception as e:
-                print(f"❌ Failed to process {directory}: {e}")
+                return None, e
+        
+        # Generate AI-enhanced metadata concurrently, writing files in order
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for directory, (metadata, error) in zip(directories, executor.map(enhance, directories)):
+                if error is not None:
+                    print(f"❌ Failed to process {directory}: {error}")
+                    continue
+                
+                meta_path = directory / "meta.yaml"
+                try:
+                    # Write metadata file
+                    with open(meta_path, 'w', encoding='utf-8') as f:
+                        yaml.dump(metadata, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
+                    YamlParser.invalidate(meta_path)
+                    
+                    print(f"✅ Enhanced {meta_path}")
+                    
+                except Exception as e:
+                    print(f"❌ Failed to process {directory}: {e}")
 
 
 def test_ollama_integration(repo_path: str = ".", model: str = "codellama:latest"):
@@ -351,7 +543,7 @@ def test_ollama_integration(repo_path: str = ".", model: str = "codellama:latest
         metadata = enhancer.enhance_metadata(test_dir)
         
         print("\n📊 Generated Metadata:")
-        print(yaml.dump(metadata, sort_keys=False, allow_unicode=True))
+        print(yaml.dump(metadata, Dumper=YamlDumper, sort_keys=False, allow_unicode=True))
         
         return metadata
     else:
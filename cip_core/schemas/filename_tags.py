@@ -16,8 +16,10 @@ import re
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+from ..utils import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class FilenameTag:
     """Parsed CIP filename tag."""
     milestone: str
@@ -33,6 +35,7 @@ class FilenameTagSchema:
     
     # Pattern for CIP filename tags
     PATTERN = r'\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]\[([^\]]+)\]_(.+)'
+    _PATTERN_RE = re.compile(PATTERN)
     
     def validate_filename(self, filename: str) -> Tuple[bool, Optional[FilenameTag]]:
         """
@@ -41,7 +44,22 @@ class FilenameTagSchema:
         Returns:
             (is_valid, parsed_tag_or_none)
         """
-        match = re.match(self.PATTERN, filename)
+        return self._parse_match(self._PATTERN_RE.match(filename))
+    
+    def validate_many(self, filenames: List[str]) -> List[Tuple[bool, Optional[FilenameTag]]]:
+        """
+        Validate and parse CIP filename tags for many filenames at once.
+        
+        Returns:
+            (is_valid, parsed_tag_or_none) for each filename, in order
+        """
+        match = self._PATTERN_RE.match
+        parse_match = self._parse_match
+        return [parse_match(match(filename)) for filename in filenames]
+    
+    @staticmethod
+    def _parse_match(match: Optional[re.Match]) -> Tuple[bool, Optional[FilenameTag]]:
+        """Build the validation result for a pattern match, or its absence."""
         if not match:
             return False, None
         
@@ -12,6 +12,8 @@ from pathlib import Path
 import jsonschema
 from jsonschema import validate, ValidationError
 
+from ..utils import YamlParser
+
 
 @dataclass
 class ValidationResult:
@@ -100,6 +102,7 @@ class MetaYamlSchema:
             "2.0": self.SCHEMA_2_0,
             "2.1": self.SCHEMA_2_0  # Same for now
         }
+        self.yaml_parser = YamlParser()
     
     def validate_file(self, file_path: Union[str, Path]) -> ValidationResult:
         """
@@ -112,8 +115,7 @@ class MetaYamlSchema:
             ValidationResult with validation status and feedback
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = self.yaml_parser.parse_file(file_path)
             
             return self.validate_data(data)
             
@@ -183,8 +185,7 @@ class MetaYamlSchema:
             ValidationResult with context-aware validation
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+            data = self.yaml_parser.parse_file(file_path) or {}
         except Exception as e:
             return ValidationResult(False, [f"Failed to load YAML: {str(e)}"], [])
         
@@ -2,6 +2,19 @@
 Shared utilities for CIP-Core operations.
 """
 
-from .yaml_parser import YamlParser
+from .yaml_parser import YamlParser, YamlLoader, YamlDumper
+from .cache import CACHE_MAX_BYTES, evict_lru
+from .compat import DATACLASS_SLOTS
+from .concurrency import IO_WORKERS
+from .lazy import lazy_module_attrs
 
-__all__ = ['YamlParser']
+__all__ = [
+    'YamlParser',
+    'YamlLoader',
+    'YamlDumper',
+    'CACHE_MAX_BYTES',
+    'evict_lru',
+    'DATACLASS_SLOTS',
+    'IO_WORKERS',
+    'lazy_module_attrs',
+]
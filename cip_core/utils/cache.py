@@ -0,0 +1,41 @@
+"""
+On-disk cache maintenance.
+"""
+
+import os
+from pathlib import Path
+from typing import Union
+
+# Size of an on-disk cache above which its least recently used entries are evicted
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def evict_lru(directory: Union[str, Path], max_bytes: int = CACHE_MAX_BYTES) -> None:
+    """
+    Remove the oldest .json entries in directory until it fits in max_bytes.
+    
+    Entries are ordered by mtime, so readers that touch an entry on a hit
+    keep it. Entries removed concurrently by another process or thread are
+    skipped rather than aborting the pass.
+    """
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            # Already evicted elsewhere; its space is freed all the same
+            pass
+        total_size -= size
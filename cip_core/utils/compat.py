@@ -0,0 +1,9 @@
+"""
+Compatibility shims for older Python versions.
+"""
+
+import sys
+
+# Keyword arguments for @dataclass that slot the class where supported; slotted
+# dataclasses drop the per-instance __dict__, and slots=True needs Python 3.10
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
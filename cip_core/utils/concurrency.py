@@ -0,0 +1,9 @@
+"""
+Thread pool sizing shared by I/O-bound operations.
+"""
+
+import os
+
+# Workers for thread pools that mostly wait on the filesystem, so more
+# threads than cores still overlap usefully
+IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
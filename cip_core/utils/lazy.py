@@ -0,0 +1,31 @@
+"""
+Lazy package exports.
+"""
+
+import sys
+from importlib import import_module
+from typing import Any, Callable, List, Mapping, Tuple
+
+
+def lazy_module_attrs(package_name: str,
+                      mapping: Mapping[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build a package's module-level __getattr__ and __dir__ (PEP 562).
+    
+    mapping names each exported attribute's submodule, relative to the
+    package, which is imported only when the attribute is first accessed.
+    The value is then stored on the package so later lookups skip this.
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = mapping.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        
+        value = getattr(import_module(module_name, package_name), name)
+        setattr(sys.modules[package_name], name, value)
+        return value
+    
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package_name])) | set(mapping))
+    
+    return __getattr__, __dir__
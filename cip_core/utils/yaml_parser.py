@@ -2,19 +2,65 @@
 YAML parsing utilities.
 """
 
+import copy
+import os
+import threading
 import yaml
-from typing import Dict, Any, Union
+from collections import OrderedDict
+from typing import Dict, Any, Tuple, Union
 from pathlib import Path
 
+# Use the libyaml-backed loader when PyYAML was built with it; the
+# pure-Python SafeLoader parses the same documents, only slower
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Likewise for dumping; shared by every module that writes YAML
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Files whose parse is kept; the least recently used is dropped beyond this
+_PARSE_CACHE_SIZE = 512
+
+# Parsed files keyed by absolute path, with the (mtime_ns, size) they were
+# read at, in least to most recently used order
+_PARSE_CACHE: 'OrderedDict[str, Tuple[Tuple[int, int], Any]]' = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
 
 class YamlParser:
     """Safe YAML parsing with validation."""
     
     def parse_file(self, file_path: Union[str, Path]) -> Dict[str, Any]:
-        """Parse YAML file safely."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        """
+        Parse YAML file safely, reusing the last parse while the file is unchanged.
+        
+        Each call returns its own copy, so callers may modify the data.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with _PARSE_CACHE_LOCK:
+            cached = _PARSE_CACHE.get(path)
+            hit = cached is not None and cached[0] == key
+            if hit:
+                _PARSE_CACHE.move_to_end(path)
+        if hit:
+            return copy.deepcopy(cached[1])
+        
+        with open(path, 'rb') as f:
+            data = yaml.load(f, Loader=YamlLoader)
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[path] = (key, data)
+            _PARSE_CACHE.move_to_end(path)
+            if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+        return copy.deepcopy(data)
+    
+    @staticmethod
+    def invalidate(file_path: Union[str, Path]) -> None:
+        """Drop a file's cached parse, for writers that can't rely on its mtime changing."""
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE.pop(os.path.abspath(file_path), None)
     
     def parse_string(self, yaml_string: str) -> Dict[str, Any]:
         """Parse YAML string safely."""
-        return yaml.safe_load(yaml_string)
+        return yaml.load(yaml_string, Loader=YamlLoader)
@@ -81,6 +81,332 @@ class TestUnifiedCIPEngine:
         total_files = len(result.files_created) + len(result.files_updated)
         assert total_files >= 0  # At least some operation should occur
 
+    def test_load_existing_metadata(self, cip_repo):
+        """Test existing metadata files are loaded and missing ones skipped."""
+        from cip_core.engine.repository import RepositoryManager
+        (cip_repo / "meta.yaml").write_text("title: Root\n")
+        
+        metadata = RepositoryManager(str(cip_repo)).load_existing_metadata()
+        
+        assert list(metadata) == ['root', 'config']
+        assert metadata['root'] == {'title': 'Root'}
+        assert metadata['config']['schema_version'] == "2.0"
+
+    def test_update_config_without_save(self, temp_repo):
+        """Test update_config applies known fields and can skip the write."""
+        engine = CIPEngine(repo_path=str(temp_repo))
+        
+        engine.update_config({"repository_title": "Demo", "unknown": 1}, save=False)
+        
+        assert engine.config.repository_title == "Demo"
+        assert not hasattr(engine.config, "unknown")
+        assert not (temp_repo / ".cip" / "core.yaml").exists()
+
+    def test_update_config_skips_unchanged_write(self, temp_repo, monkeypatch):
+        """Test an unchanged configuration is not written twice."""
+        (temp_repo / ".cip").mkdir()
+        engine = CIPEngine(repo_path=str(temp_repo))
+        writes = []
+        original_save = engine.config.save_to_file
+        monkeypatch.setattr(engine.config, "save_to_file", lambda path: writes.append(path) or original_save(path))
+        
+        engine.update_config({"repository_title": "Demo"})
+        engine.update_config({"repository_title": "Demo"})
+        engine.update_config({"repository_title": "Other"})
+        
+        assert len(writes) == 2
+
+    def test_repository_scan(self, temp_repo):
+        """Test a single scan, pruned at ignored trees, feeds project type detection and metadata lookup."""
+        from cip_core.engine.repository import RepositoryManager, ProjectType
+        (temp_repo / "experiments" / "run1").mkdir(parents=True)
+        (temp_repo / "experiments" / "run1" / "meta.yaml").write_text("title: Run\n")
+        (temp_repo / ".git").mkdir()
+        (temp_repo / ".git" / "meta.yaml").write_text("title: Hidden\n")
+        (temp_repo / "node_modules" / "pkg").mkdir(parents=True)
+        (temp_repo / "node_modules" / "pkg" / "meta.yaml").write_text("title: Vendored\n")
+        
+        repo = RepositoryManager(str(temp_repo))
+        scan = repo.scan()
+        
+        assert scan is repo.scan()
+        assert scan.top_level_dirs == {"experiments"}
+        assert repo.detect_project_type() == ProjectType.THEORY
+        assert repo.get_all_metadata_files() == [temp_repo.resolve() / "experiments" / "run1" / "meta.yaml"]
+
+    def test_is_ignored_batch_matches_is_ignored(self, temp_repo):
+        """Test batch ignore checks agree with per-path checks."""
+        from cip_core.engine.repository import RepositoryManager
+        (temp_repo / ".gitignore").write_text("# comment\nbuild/\n*.log\ndocs/generated\n")
+        for name in ["build", "src", "docs/generated", "node_modules"]:
+            (temp_repo / name).mkdir(parents=True)
+        (temp_repo / "src" / "build").write_text("not a directory")
+        
+        repo = RepositoryManager(str(temp_repo))
+        paths = [repo.path / p for p in [
+            "build", "src", "src/build", "src/app.log", "docs/generated",
+            "node_modules", "src/module.pyc", "README.md",
+        ]] + [Path("/elsewhere")]
+        
+        expected = [True, False, True, True, True, True, True, False, True]
+        assert [repo.is_ignored(p) for p in paths] == expected
+        assert repo.is_ignored_batch(paths) == expected
+
+    def test_write_files_reports_failures(self, temp_repo):
+        """Test batched writes land on disk and report unwritable paths."""
+        from cip_core.engine.repository import RepositoryManager
+        for name in ["a", "b"]:
+            (temp_repo / name).mkdir()
+        repo = RepositoryManager(str(temp_repo))
+
+        failures = repo.write_files([
+            (temp_repo / "a" / "meta.yaml", b"title: A\n"),
+            (temp_repo / "b" / "meta.yaml", b"title: B\n"),
+            (temp_repo / "missing" / "meta.yaml", b"title: M\n"),
+        ])
+
+        assert (temp_repo / "a" / "meta.yaml").read_bytes() == b"title: A\n"
+        assert (temp_repo / "b" / "meta.yaml").read_bytes() == b"title: B\n"
+        assert [path for path, _ in failures] == [temp_repo / "missing" / "meta.yaml"]
+
+
+class TestMetadataEngine:
+    """Test the MetadataEngine strategy registry and maintenance helpers."""
+
+    def test_generators_created_on_first_use(self, temp_repo):
+        """Test strategies are only constructed when requested."""
+        from cip_core.engine.repository import RepositoryManager
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+        
+        assert engine._instances == {}
+        assert engine.get_available_strategies() == ['rule_based', 'ai_enhanced', 'hybrid']
+        
+        info = engine.get_strategy_info("rule_based")
+        
+        assert info["strategy_name"] == "rule_based"
+        assert info["requirements"]["ai_provider"] is False
+        with pytest.raises(TypeError):
+            info["requirements"]["ai_provider"] = True
+        assert list(engine._instances) == ['rule_based']
+        assert "error" in engine.get_strategy_info("missing")
+
+    def test_validate_strategy_config(self, temp_repo):
+        """Test built-in and registered strategy validators."""
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+
+        assert engine.validate_strategy_config("rule_based", GenerationConfig()) == []
+        assert engine.validate_strategy_config("ai_enhanced", GenerationConfig()) == [
+            "AI enhanced strategy requires an AI provider"]
+        assert engine.validate_strategy_config("hybrid", GenerationConfig(ai_provider="ollama")) == [
+            "Hybrid strategy with Ollama requires a model specification"]
+        assert engine.validate_strategy_config("missing", GenerationConfig()) == ["Unknown strategy: missing"]
+
+        engine.register_strategy("custom", engine._get("rule_based"),
+                                 validator=lambda config: [] if config.ai_model else ["Needs a model"])
+        assert engine.validate_strategy_config("custom", GenerationConfig()) == ["Needs a model"]
+        engine.register_strategy("ai_enhanced", engine._get("rule_based"))
+        assert engine.validate_strategy_config("ai_enhanced", GenerationConfig()) == []
+
+    def test_preview_without_capability_skips_construction(self, temp_repo):
+        """Test previews only construct generators that support them."""
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+        
+        ai_preview = engine.generate_preview("ai_enhanced", GenerationConfig())
+        rule_preview = engine.generate_preview("rule_based", GenerationConfig())
+        
+        assert "error" in ai_preview["metadata"]
+        assert rule_preview["metadata"]["schema_version"] == "2.0"
+        assert list(engine._instances) == ['rule_based']
+
+    def test_rule_based_results_cached_on_disk(self, temp_repo, monkeypatch):
+        """Test an unchanged tree reuses the cached rule-based result."""
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        (temp_repo / "src").mkdir()
+        (temp_repo / "src" / "main.py").write_text("def main(): pass")
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+        
+        first = engine.generate("rule_based", GenerationConfig())
+        calls = []
+        generator = engine._get("rule_based")
+        monkeypatch.setattr(generator, "generate", lambda repo, config: calls.append(config) or first)
+        second = engine.generate("rule_based", GenerationConfig())
+        
+        assert calls == []
+        assert first.files_created
+        assert second.files_created + second.files_updated == []
+        assert second.metadata == first.metadata
+        
+        (temp_repo / "src" / "extra.py").write_text("x = 1")
+        engine.generate("rule_based", GenerationConfig())
+        assert len(calls) == 1
+
+    def test_generate_iter_streams_directory_results(self, temp_repo):
+        """Test rule-based generation yields one result per directory, in walk order."""
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        (temp_repo / "src" / "pkg").mkdir(parents=True)
+        (temp_repo / "src" / "main.py").write_text("def main(): pass")
+        (temp_repo / "zeta").mkdir()
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+
+        results = list(engine.generate_iter("rule_based", GenerationConfig()))
+
+        assert [r.key for r in results] == ["root", "src", str(Path("src/pkg")), "zeta"]
+        assert all(r.error is None for r in results)
+        assert (temp_repo / "src" / "meta.yaml").exists()
+
+        ai_results = list(engine.generate_iter("ai_enhanced", GenerationConfig(force_overwrite=True)))
+        assert [r.key for r in ai_results] == ["root", "src", str(Path("src/pkg")), "zeta"]
+        assert all(r.status == "updated" for r in ai_results)
+        with pytest.raises(ValueError):
+            engine.generate_iter("unknown", GenerationConfig())
+
+    def test_semantic_scope_keeps_part_order(self):
+        """Test compound names map to de-duplicated scopes in name order."""
+        from cip_core.generation.strategies import RuleBasedGenerator
+        generator = RuleBasedGenerator()
+
+        assert generator._get_semantic_scope("cip_core") == ["cip_protocol", "cognition_index", "core"]
+        assert generator._get_semantic_scope("test-testing") == ["testing", "validation"]
+        assert generator._get_semantic_scope("Docs") == ["documentation", "guides"]
+        assert generator._get_semantic_scope("misc") == ["misc"]
+
+    def test_enhanced_description_lookup(self):
+        """Test exact names win over keywords, and keywords over file contents."""
+        from cip_core.generation.strategies import AIEnhancedGenerator
+        generator = AIEnhancedGenerator()
+        describe = lambda name, files=(): generator._create_enhanced_description(
+            name, {}, generator._get_semantic_scope(name), [], list(files))
+
+        assert describe("engine").startswith("The engine directory contains the core engine")
+        assert describe("Engine").startswith("The Engine directory is reserved for")
+        assert describe("unit-tests", ["a.py"]).startswith("The unit-tests directory contains test suites and testing utilities for unit.")
+        assert describe("test-docs").startswith("The test-docs directory contains project documentation")
+        assert describe("reference", ["README.md"]).startswith("The reference directory provides technical reference")
+        assert describe("notes", ["README.md"]).startswith("The notes directory contains documentation and readme files")
+
+    def test_quality_score(self):
+        """Test the quality score averages per-directory field coverage."""
+        from cip_core.generation.strategies import AIEnhancedGenerator
+        generator = AIEnhancedGenerator()
+
+        assert generator._calculate_quality_score({}) == 0.0
+        score = generator._calculate_quality_score({
+            ".": {"description": "x" * 21, "semantic_scope": ["core"],
+                  "files": ["a.py"], "child_directories": []},
+            "docs": {"description": "short", "semantic_scope": [], "files": []},
+        })
+        assert score == pytest.approx(0.5)
+
+    def test_generation_lists_each_directory_once(self, temp_repo, monkeypatch):
+        """Test generators reuse directory listings within a run."""
+        from collections import Counter
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        (temp_repo / "src" / "pkg").mkdir(parents=True)
+        (temp_repo / "src" / "pkg" / "main.py").write_text("def main(): pass")
+        repo = RepositoryManager(str(temp_repo))
+        engine = MetadataEngine(repo)
+        listed = Counter()
+        original = repo.get_directory_structure
+        monkeypatch.setattr(repo, "get_directory_structure",
+                            lambda path=None: listed.update([path]) or original(path))
+
+        for strategy in ("rule_based", "ai_enhanced"):
+            listed.clear()
+            engine.generate(strategy, GenerationConfig(use_cache=False, force_overwrite=True))
+            assert set(listed.values()) == {1}
+
+    @pytest.mark.parametrize("batch_writes", [True, False])
+    def test_forced_rerun_skips_unchanged_files(self, temp_repo, batch_writes):
+        """Test overwriting leaves files alone when their content would not change."""
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        (temp_repo / "src").mkdir()
+        (temp_repo / "src" / "main.py").write_text("def main(): pass")
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+        config = GenerationConfig(force_overwrite=True, use_cache=False, batch_writes=batch_writes)
+
+        first = engine.generate("rule_based", config)
+        (temp_repo / "src" / "meta.yaml").write_text("description: edited\n")
+        second = engine.generate("rule_based", config)
+
+        assert len(first.files_created) == 2 and first.files_updated == []
+        assert second.files_created == []
+        assert second.files_updated == [str(temp_repo / "src" / "meta.yaml")]
+        assert "edited" not in (temp_repo / "src" / "meta.yaml").read_text()
+        assert not list(temp_repo.rglob("*.tmp"))
+
+    def test_batched_writes_match_immediate_writes(self, temp_repo, tmp_path):
+        """Test batched meta.yaml writes produce the same files as immediate writes."""
+        import shutil
+        from cip_core.engine.repository import RepositoryManager
+        from cip_core.engine.config import GenerationConfig
+        (temp_repo / "src" / "pkg").mkdir(parents=True)
+        (temp_repo / "src" / "pkg" / "main.py").write_text("def main(): pass")
+        (temp_repo / "docs").mkdir()
+        copy = tmp_path / "copy" / temp_repo.name
+        shutil.copytree(temp_repo, copy)
+
+        batched = MetadataEngine(RepositoryManager(str(temp_repo))).generate(
+            "rule_based", GenerationConfig(batch_writes=True, use_cache=False))
+        immediate = MetadataEngine(RepositoryManager(str(copy))).generate(
+            "rule_based", GenerationConfig(batch_writes=False, use_cache=False))
+
+        assert batched.success and immediate.success
+        assert batched.metadata == immediate.metadata
+        for rel in ["meta.yaml", "src/meta.yaml", "src/pkg/meta.yaml", "docs/meta.yaml"]:
+            assert (temp_repo / rel).read_bytes() == (copy / rel).read_bytes()
+
+    def test_cleanup_metadata_reports_issues(self, temp_repo):
+        """Test cleanup flags invalid metadata and files in ignored directories."""
+        from cip_core.engine.repository import RepositoryManager
+        (temp_repo / ".gitignore").write_text("build/\n")
+        for name, content in {
+            "good": "schema_version: '2.0'\ndescription: Handles parsing\n",
+            "generic": "schema_version: '2.0'\ndescription: TODO describe\n",
+            "old": "schema_version: '0.5'\n",
+            "missing": "description: Something useful\n",
+            "broken": "key: [unclosed\n",
+            "build": "description: placeholder\n",
+        }.items():
+            (temp_repo / name).mkdir()
+            (temp_repo / name / "meta.yaml").write_text(content)
+        engine = MetadataEngine(RepositoryManager(str(temp_repo)))
+        
+        result = engine.cleanup_metadata(dry_run=True)
+        
+        issues = {Path(item["file"]).parent.name: item["issues"] for item in result["files_with_issues"]}
+        assert result["total_files_checked"] == 6
+        assert [Path(f).parent.name for f in result["files_to_remove"]] == ["build"]
+        assert issues["generic"] == ["Generic description"]
+        assert issues["old"] == ["Unsupported schema version: 0.5"]
+        assert issues["missing"] == ["Missing schema_version"]
+        assert issues["broken"][0].startswith("Parse error")
+        assert "good" not in issues
+        assert "build" not in issues
+        assert (temp_repo / "build" / "meta.yaml").exists()
+        
+        # Files found clean are not parsed again while unchanged
+        checked = []
+        original_check = engine._check_metadata_content
+        engine._check_metadata_content = lambda path, size: checked.append(path.parent.name) or original_check(path, size)
+        assert engine.cleanup_metadata(dry_run=True) == result
+        assert "good" not in checked and "build" not in checked
+        assert "generic" in checked
+        
+        result = engine.cleanup_metadata(dry_run=False)
+        
+        assert result["files_actually_removed"] == 1
+        assert result["removal_errors"] == []
+        assert not (temp_repo / "build" / "meta.yaml").exists()
+        assert (temp_repo / "good" / "meta.yaml").exists()
+
 
 class TestDirectoryMetadataGenerator:
     """Test the DirectoryMetadataGenerator class (backwards compatibility)."""
@@ -4,11 +4,12 @@ Unit tests for cip_core.cli module.
 
 import pytest
 import json
+import os
 import yaml
 from pathlib import Path
 from click.testing import CliRunner
 
-from cip_core.cli.main import cli, init, validate, ai_metadata, generate_instructions
+from cip_core.cli.main import cli, init, validate, ai_metadata, ai_enhance, generate_instructions
 
 
 class TestCLIBasics:
@@ -257,6 +258,60 @@ class TestAIMetadataCommand:
         # Should fail gracefully with nonexistent model
         assert "model" in result.output.lower() or "error" in result.output.lower()
 
+    def test_ai_enhance_reuses_cached_responses(self, cip_repo, temp_repo, tmp_path, monkeypatch):
+        """Test unchanged directories reuse stored Ollama responses instead of regenerating."""
+        from cip_core.ollama_local import client
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        prompts = []
+        def generate(self, model, prompt, system=None, options=None):
+            prompts.append(prompt)
+            return "testing, utilities"
+        monkeypatch.setattr(client.OllamaClient, "generate", generate)
+        
+        runner = CliRunner()
+        result = runner.invoke(ai_enhance, ['--path', str(cip_repo), '--force'])
+        assert result.exit_code == 0
+        assert len(prompts) == 4
+        generated = (cip_repo / "src" / "meta.yaml").read_text()
+        
+        result = runner.invoke(ai_enhance, ['--path', str(cip_repo), '--force'])
+        assert result.exit_code == 0
+        assert len(prompts) == 4
+        assert (cip_repo / "src" / "meta.yaml").read_text() == generated
+        
+        # A changed directory is generated again
+        (cip_repo / "src" / "util.py").write_text("# Utilities")
+        result = runner.invoke(ai_enhance, ['--path', str(cip_repo), '--force'])
+        assert result.exit_code == 0
+        assert len(prompts) == 6
+        
+        # Without the cache every directory is generated again
+        result = runner.invoke(ai_enhance, ['--path', str(cip_repo), '--force', '--no-cache'])
+        assert result.exit_code == 0
+        assert len(prompts) == 10
+    
+    def test_ai_enhance_cache_evicts_least_recently_used(self, tmp_path, monkeypatch):
+        """Test the response cache drops the oldest entries once over its size limit."""
+        from cip_core.ollama_local import client
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        monkeypatch.setattr(client, "CACHE_MAX_BYTES", 100)
+        monkeypatch.setattr(client.OllamaClient, "generate",
+                            lambda self, model, prompt, system=None, options=None: "x" * 30)
+        enhancer = client.AIMetadataEnhancer()
+        def store(prompt):
+            before = set(enhancer._cache_dir.glob("*.json")) if enhancer._cache_dir.exists() else set()
+            enhancer._generate(prompt, "system")
+            return (set(enhancer._cache_dir.glob("*.json")) - before).pop()
+        
+        first, second = store("a"), store("b")
+        os.utime(first, ns=(1, 1))
+        os.utime(second, ns=(2, 2))
+        enhancer._generate("a", "system")  # A hit makes it the most recently used
+        third = store("c")
+        
+        assert first.exists() and third.exists()
+        assert not second.exists()
+
 
 class TestGenerateInstructionsCommand:
     """Test the 'cip generate-instructions' command."""
@@ -304,6 +359,118 @@ class TestGenerateInstructionsCommand:
         # Should have generated instructions (may overwrite by default)
         assert "Generated instruction files" in result.output
 
+    def test_analyze_repository_structure(self, temp_repo):
+        """Test repository analysis classifies files in one walk."""
+        from cip_core.instructions import CIPInstructionsGenerator
+
+        (temp_repo / "src").mkdir()
+        (temp_repo / "src" / "meta.yaml").write_text('schema_version: "2.0"\nsemantic_scope: [core]\n')
+        (temp_repo / "docs").mkdir()
+        (temp_repo / "docs" / "[exp][v1]notes.md").write_text("notes")
+        (temp_repo / "docs" / "[draft].md").write_text("draft")
+        (temp_repo / "blueprints").mkdir()
+        (temp_repo / "blueprints" / "plan.md").write_text("plan")
+        (temp_repo / "node_modules").mkdir()
+        (temp_repo / "node_modules" / "meta.yaml").write_text('schema_version: "9.9"\n')
+
+        analysis = CIPInstructionsGenerator(str(temp_repo)).analyze_repository_structure()
+
+        assert [(meta["path"], meta["directory"]) for meta in analysis["meta_yaml_files"]] == [
+            (str(Path("src") / "meta.yaml"), "src")
+        ]
+        assert analysis["schema_versions"] == {"2.0"}
+        assert analysis["experimental_files"] == [str(Path("docs") / "[exp][v1]notes.md")]
+        assert analysis["blueprint_files"] == [str(Path("blueprints") / "plan.md")]
+
+        # Only paths inside the repository count towards blueprint detection
+        kit = temp_repo / "blueprint-kit"
+        kit.mkdir()
+        (kit / "notes.md").write_text("notes")
+        assert CIPInstructionsGenerator(str(kit)).analyze_repository_structure()["blueprint_files"] == []
+
+    def test_usage_instructions_order_schema_versions(self, temp_repo):
+        """Test schema versions are listed in numeric order with the latest last."""
+        from cip_core.instructions import CIPInstructionsGenerator
+
+        analysis = {"schema_versions": {"2.0", "10.0", "9.1"}, "meta_yaml_files": [],
+                    "experimental_files": [], "theory_documents": [], "blueprint_files": []}
+        usage = CIPInstructionsGenerator(str(temp_repo)).generate_usage_instructions(analysis)
+
+        assert usage["cip_version"] == "10.0"
+        assert usage["repository_structure"]["schema_versions_found"] == ["2.0", "9.1", "10.0"]
+
+    def test_core_orientation_categories(self, temp_repo):
+        """Test directories land in the first category their scope matches."""
+        from cip_core.instructions import CIPInstructionsGenerator
+
+        analysis = {"meta_yaml_files": [
+            {"directory": "math", "semantic_scope": ["tools", "mathematics"]},
+            {"directory": "specs", "semantic_scope": [{"nested": "value"}, "design"]},
+            {"directory": "misc", "semantic_scope": ["misc"]},
+        ]}
+        core = CIPInstructionsGenerator(str(temp_repo)).generate_core_orientation(analysis)
+
+        assert core["document_categories"] == {
+            "theory": ["math"],
+            "experiments": [],
+            "blueprints": ["specs"],
+            "tools": [],
+            "documentation": [],
+        }
+        assert set(core["primary_directories"]) == {"math", "specs", "misc"}
+
+    def test_validate_skips_files_it_generated(self, temp_repo, monkeypatch):
+        """Test validation only re-parses instruction files changed since generation."""
+        from cip_core.instructions import CIPInstructionsGenerator
+
+        generator = CIPInstructionsGenerator(str(temp_repo))
+        generator.generate_all_instructions()
+
+        parsed = []
+        parse_file = generator.yaml_parser.parse_file
+        def counting_parse(file_path):
+            parsed.append(Path(file_path).name)
+            return parse_file(file_path)
+        monkeypatch.setattr(generator.yaml_parser, "parse_file", counting_parse)
+
+        assert generator.validate_instructions()["valid"]
+        assert parsed == []
+
+        (temp_repo / ".cip" / "core.yaml").write_text("broken: [\n")
+        validation = generator.validate_instructions()
+        assert not validation["valid"]
+        assert parsed == ["core.yaml"]
+
+    def test_analysis_cached_until_tree_changes(self, temp_repo, monkeypatch):
+        """Test repository analysis is reused until a directory or meta.yaml changes."""
+        from cip_core.instructions import CIPInstructionsGenerator
+
+        (temp_repo / "src").mkdir()
+        meta_file = temp_repo / "src" / "meta.yaml"
+        meta_file.write_text('schema_version: "2.0"\n')
+        first = CIPInstructionsGenerator(str(temp_repo)).analyze_repository_structure()
+
+        scans = []
+        original_scan = CIPInstructionsGenerator._scan_repository_structure
+        def counting_scan(self):
+            scans.append(self.repo_root)
+            return original_scan(self)
+        monkeypatch.setattr(CIPInstructionsGenerator, "_scan_repository_structure", counting_scan)
+
+        assert CIPInstructionsGenerator(str(temp_repo)).analyze_repository_structure() == first
+        assert scans == []
+
+        meta_file.write_text('schema_version: "2.10"\n')
+        assert CIPInstructionsGenerator(str(temp_repo)).analyze_repository_structure()["schema_versions"] == {"2.10"}
+
+        (temp_repo / "src" / "[exp][v1]notes.md").write_text("notes")
+        analysis = CIPInstructionsGenerator(str(temp_repo)).analyze_repository_structure()
+        assert analysis["experimental_files"] == [str(Path("src") / "[exp][v1]notes.md")]
+        assert len(scans) == 2
+
+        CIPInstructionsGenerator(str(temp_repo), use_cache=False).analyze_repository_structure()
+        assert len(scans) == 3
+
 
 # Integration tests for CLI
 class TestCLIIntegration:
@@ -0,0 +1,181 @@
+"""
+Unit tests for cip_core.navigation module.
+"""
+
+import pytest
+import yaml
+from pathlib import Path
+
+from cip_core.navigation import RepositoryResolver, DependencyGraph, ContentDiscovery
+
+
+@pytest.fixture
+def ecosystem(temp_repo):
+    """Create an ecosystem root holding two CIP repositories that link to each other."""
+    for name, target in (("alpha", "beta"), ("beta", "alpha")):
+        repo = temp_repo / name
+        (repo / ".cip").mkdir(parents=True)
+        (repo / ".cip" / "meta.yaml").write_text(yaml.safe_dump({
+            "schema_version": "2.0",
+            "repository_role": "theory",
+            "title": name.title(),
+            "ecosystem_links": {"peer": f"repo://{target}/docs/"},
+        }))
+        (repo / "docs").mkdir()
+        (repo / "docs" / "entropy.md").write_text("# Entropy")
+    return temp_repo
+
+
+class TestRepositoryResolver:
+    """Test the RepositoryResolver class."""
+
+    def test_parse_repo_url(self, ecosystem):
+        """Test repo:// URLs split into parts, with each call getting its own reference."""
+        resolver = RepositoryResolver(str(ecosystem))
+
+        ref = resolver.parse_repo_url("repo://alpha/docs/#usage")
+        assert (ref.scheme, ref.repository, ref.path, ref.fragment) == ("repo", "alpha", "docs/", "usage")
+        assert resolver.parse_repo_url("repo://alpha/docs/#usage") is not ref
+
+        with pytest.raises(ValueError):
+            resolver.parse_repo_url("https://alpha/docs/")
+        with pytest.raises(ValueError):
+            resolver.parse_repo_url("repo:///docs/")
+
+    def test_meta_yaml_parsed_once_until_changed(self, ecosystem, monkeypatch):
+        """Test directory metadata is re-parsed only after the file changes, and each caller gets a copy."""
+        from cip_core.utils import yaml_parser
+        resolver = RepositoryResolver(str(ecosystem))
+        meta_path = ecosystem / "alpha" / "docs" / "meta.yaml"
+        meta_path.write_text("description: Entropy notes\n")
+
+        parsed = []
+        load = yaml_parser.yaml.load
+        def counting_load(stream, Loader):
+            if stream.name == str(meta_path):
+                parsed.append(stream.name)
+            return load(stream, Loader=Loader)
+        monkeypatch.setattr(yaml_parser.yaml, "load", counting_load)
+
+        for _ in range(3):
+            resolved = resolver.resolve_content("repo://alpha/docs/")
+            assert resolved.metadata == {"description": "Entropy notes"}
+            resolved.metadata["description"] = "Changed by caller"
+        assert len(parsed) == 1
+
+        meta_path.write_text("description: Updated entropy notes\n")
+        assert resolver.resolve_content("repo://alpha/docs/").metadata == {"description": "Updated entropy notes"}
+        assert len(parsed) == 2
+
+    def test_repositories_scanned_on_first_use(self, ecosystem, monkeypatch):
+        """Test repositories are loaded lazily, one at a time for lookups by name."""
+        (ecosystem / "notes").mkdir()
+        resolver = RepositoryResolver(str(ecosystem))
+
+        parsed = []
+        parse_file = resolver.yaml_parser.parse_file
+        def counting_parse(file_path):
+            # Only repository metadata; directory metadata is looked up per resolve
+            if Path(file_path).parent.name == ".cip":
+                parsed.append(Path(file_path).relative_to(ecosystem).parts[0])
+            return parse_file(file_path)
+        monkeypatch.setattr(resolver.yaml_parser, "parse_file", counting_parse)
+
+        assert resolver.parse_repo_url("repo://alpha/docs/").repository == "alpha"
+        assert parsed == []
+
+        assert resolver.resolve_content("repo://alpha/docs/entropy.md").exists
+        assert not resolver.resolve_content("repo://notes/").exists
+        assert not resolver.resolve_content("repo://../alpha/").exists
+        assert parsed == ["alpha"]
+
+        assert [result["exists"] for result in resolver.validate_ecosystem_links("alpha")] == [True]
+        assert parsed == ["alpha", "beta"]
+
+        assert sorted(resolver.list_repositories()) == ["alpha", "beta"]
+        assert parsed == ["alpha", "beta"]
+
+
+class TestDependencyGraph:
+    """Test the DependencyGraph class."""
+
+    def test_dependency_graph_uses_links_parsed_at_scan(self, ecosystem, monkeypatch):
+        """Test graph analyses reuse the links parsed when repositories were scanned."""
+        meta_path = ecosystem / "alpha" / ".cip" / "meta.yaml"
+        metadata = yaml.safe_load(meta_path.read_text())
+        metadata["ecosystem_links"].update({
+            "self": "repo://alpha/",
+            "again": "repo://beta/src/",
+            "broken": "https://example.com/",
+            "numeric": 42,
+        })
+        meta_path.write_text(yaml.safe_dump(metadata))
+
+        resolver = RepositoryResolver(str(ecosystem))
+        resolver.list_repositories()
+        monkeypatch.setattr(resolver, "parse_repo_url", lambda url: pytest.fail("links re-parsed"))
+        graph = DependencyGraph(resolver)
+
+        assert graph.build_dependency_graph() == {"alpha": ["beta"], "beta": ["alpha"]}
+        assert graph.get_repository_metrics()["alpha"] == {"dependencies": 1, "dependents": 1, "centrality": 2}
+        assert len(graph.find_dependency_cycles()) == 1
+
+    def test_find_dependency_cycles(self, ecosystem):
+        """Test cycles are reported once each, including along chains deeper than the recursion limit."""
+        graph = DependencyGraph(RepositoryResolver(str(ecosystem)))
+        (cycle,) = graph.find_dependency_cycles()
+        assert cycle[0] == cycle[-1] and sorted(cycle[:-1]) == ["alpha", "beta"]
+
+        chain = [f"repo{i}" for i in range(5000)]
+        graph._dependency_graph_cache = {name: [dependency] for name, dependency in zip(chain, chain[1:] + ["repo2500"])}
+        graph._dependency_graph_cache["repo10"].append("repo5")
+        assert graph.find_dependency_cycles() == [chain[2500:] + ["repo2500"], chain[5:11] + ["repo5"]]
+
+
+class TestContentDiscovery:
+    """Test the ContentDiscovery class."""
+
+    def test_discover_content_by_type_skips_vendor_directories(self, ecosystem):
+        """Test matching directories are found at any depth outside vendored trees."""
+        (ecosystem / "alpha" / "src" / "Docs").mkdir(parents=True)
+        (ecosystem / "alpha" / "node_modules" / "docs").mkdir(parents=True)
+        (ecosystem / "alpha" / "docs" / "meta.yaml").write_text("description: Project docs\n")
+
+        discovery = ContentDiscovery(RepositoryResolver(str(ecosystem)))
+        content = discovery.discover_content_by_type("docs")
+
+        assert [item["path"] for item in content["alpha"]] == ["docs", str(Path("src") / "Docs")]
+        assert content["alpha"][0]["metadata"] == {"description": "Project docs"}
+        assert content["alpha"][0]["repo_url"] == "repo://alpha/docs/"
+        assert [item["path"] for item in content["beta"]] == ["docs"]
+
+    def test_find_similar_content(self, ecosystem):
+        """Test markdown files match on their name or their directory's metadata."""
+        (ecosystem / "beta" / "docs" / "meta.yaml").write_text("description: Field notes\ntags: [theory]\n")
+        (ecosystem / "beta" / "docs" / "overview.md").write_text("# Overview")
+
+        discovery = ContentDiscovery(RepositoryResolver(str(ecosystem)))
+
+        matches = {(m["repository"], m["path"], m["match_type"]) for m in discovery.find_similar_content("entropy")}
+        assert matches == {
+            ("alpha", str(Path("docs") / "entropy.md"), "filename"),
+            ("beta", str(Path("docs") / "entropy.md"), "filename"),
+        }
+        matches = {(m["repository"], m["path"], m["match_type"]) for m in discovery.find_similar_content("theory")}
+        assert matches == {
+            ("beta", str(Path("docs") / "entropy.md"), "metadata"),
+            ("beta", str(Path("docs") / "overview.md"), "metadata"),
+        }
+
+    def test_find_similar_content_reports_each_file_once_up_to_limit(self, ecosystem, monkeypatch):
+        """Test a file matching by name and metadata is reported once, and the walk stops at the limit."""
+        (ecosystem / "alpha" / "docs" / "meta.yaml").write_text("description: Entropy notes\n")
+        discovery = ContentDiscovery(RepositoryResolver(str(ecosystem)))
+
+        matches = [(m["repository"], m["match_type"]) for m in discovery.find_similar_content("entropy")]
+        assert sorted(matches) == [("alpha", "filename"), ("beta", "filename")]
+
+        for i in range(60):
+            (ecosystem / "alpha" / "docs" / f"entropy-{i}.md").write_text("# Entropy")
+        monkeypatch.setattr(discovery.resolver.yaml_parser, "parse_file", lambda meta_path: pytest.fail("metadata loaded"))
+        assert len(discovery.find_similar_content("entropy")) == 50
@@ -6,7 +6,7 @@ import pytest
 import yaml
 from pathlib import Path
 
-from cip_core.schemas import MetaYamlSchema, RepositorySchema
+from cip_core.schemas import MetaYamlSchema, RepositorySchema, FilenameTagSchema
 from cip_core.schemas.meta_yaml import ValidationResult
 
 
@@ -120,6 +120,48 @@ class TestMetaYamlSchema:
             # Expected behavior
             assert True
 
+    def test_validate_file_parses_once_until_changed(self, meta_yaml_schema, sample_meta_yaml, temp_repo, monkeypatch):
+        """Test validating an unchanged file reuses its parse."""
+        from cip_core.utils import yaml_parser
+        meta_path = temp_repo / "meta.yaml"
+        meta_path.write_text(yaml.safe_dump(sample_meta_yaml))
+        
+        parsed = []
+        load = yaml_parser.yaml.load
+        def counting_load(stream, Loader):
+            parsed.append(stream)
+            return load(stream, Loader=Loader)
+        monkeypatch.setattr(yaml_parser.yaml, "load", counting_load)
+        
+        assert meta_yaml_schema.validate_file(meta_path).is_valid
+        assert meta_yaml_schema.validate_file_with_context(str(meta_path), is_root=True).is_valid
+        assert len(parsed) == 1
+        
+        meta_path.write_text(yaml.safe_dump(dict(sample_meta_yaml, schema_version="9.9")))
+        assert not meta_yaml_schema.validate_file(meta_path).is_valid
+        assert len(parsed) == 2
+        
+        meta_path.write_text(": [broken")
+        assert meta_yaml_schema.validate_file(meta_path).errors[0].startswith("YAML parsing error")
+
+    def test_parse_cache_is_bounded(self, temp_repo, monkeypatch):
+        """Test the parse cache keeps only the most recently used files."""
+        from cip_core.utils import yaml_parser
+        monkeypatch.setattr(yaml_parser, "_PARSE_CACHE_SIZE", 2)
+        monkeypatch.setattr(yaml_parser, "_PARSE_CACHE", yaml_parser.OrderedDict())
+        paths = []
+        for name in ["a", "b", "c"]:
+            paths.append(temp_repo / f"{name}.yaml")
+            paths[-1].write_text(f"name: {name}\n")
+        
+        parser = yaml_parser.YamlParser()
+        parser.parse_file(paths[0])
+        parser.parse_file(paths[1])
+        parser.parse_file(paths[0])
+        parser.parse_file(paths[2])
+        
+        assert list(yaml_parser._PARSE_CACHE) == [str(paths[0]), str(paths[2])]
+    
     def test_save_to_file(self, meta_yaml_schema, sample_meta_yaml, temp_repo):
         """Test saving meta.yaml to file - simulated."""
         output_path = temp_repo / "test_meta.yaml"
@@ -197,6 +239,21 @@ class TestRepositorySchema:
         assert ".cip/meta.yaml" in schema.required_files
 
 
+class TestFilenameTagSchema:
+    """Test the FilenameTagSchema class."""
+
+    def test_validate_many_matches_validate_filename(self):
+        """Test batch validation gives each filename's single validation result, in order."""
+        schema = FilenameTagSchema()
+        filenames = ["[m][D][v1.0][C1][I1]_entropy.md", "entropy.md", "[m][E][v2][C2]_missing_item.md", "[a][b][c][d][e]_f"]
+
+        results = schema.validate_many(filenames)
+
+        assert results == [schema.validate_filename(name) for name in filenames]
+        assert [valid for valid, _ in results] == [True, False, False, True]
+        assert results[0][1].base_name == "entropy.md"
+
+
 class TestValidationResult:
     """Test the ValidationResult class."""
 